@@ -111,6 +111,8 @@ def health_check():
                 health_status["description"] = "Degraded: Redis unavailable but database operational"
                 status_code = 207  # Multi-Status - Partial success
         else:
+            # The shared client only PINGs when it is created: ask Redis itself.
+            r.ping()
             health_status["redis"]["status"] = "operational"
             health_status["redis"]["description"] = "Redis connection successful"
     except Exception as e:
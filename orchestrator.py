@@ -1,8 +1,12 @@
 import asyncio
+import atexit
 import logging
+import subprocess
+import sys
+from datetime import datetime, timedelta, timezone
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
-from apscheduler.triggers.interval import IntervalTrigger
+from apscheduler.triggers.date import DateTrigger
 from tasks.prewarm_h2h import PrewarmCacheWorker
 from tasks.live_matches import LiveWorker
 from tasks.prewarm_odds import PrewarmOddsWorker
@@ -10,6 +14,7 @@ from tasks.prewarm_bet_radar import BetRadarPrewarmWorker
 from tasks.persist_finished_fixtures import PersistFinishedFixturesWorker
 from tasks.persist_h2h_fixtures import PersistH2HFixturesWorker
 from tasks.persist_recent_matches import PersistRecentMatchesWorker
+from services.sports_api_client import SportsAPIClient
 from dotenv import load_dotenv
 import os
 
@@ -18,9 +23,13 @@ logging.getLogger('apscheduler').setLevel(logging.WARNING)
 logger = logging.getLogger('Orchestrator')
 
 load_dotenv()
-minutes_interval = int(os.getenv("WORKER_INTERVAL_MINUTES", 5))
 pipeline_hour = int(os.getenv("PIPELINE_HOUR", 0))
 pipeline_minute = int(os.getenv("PIPELINE_MINUTE", 15))
+# Post-match job consumers (tasks/job_worker.py) run as a child of the orchestrator
+# unless they are deployed as their own process.
+start_job_workers = os.getenv("ORCHESTRATOR_RUNS_JOB_WORKERS", "true").lower() == "true"
+# Requests kept back on top of the live worker's own estimate (post-match refreshes, manual routes).
+quota_safety_margin = int(os.getenv("QUOTA_SAFETY_MARGIN", 100))
 
 prewarm_worker = PrewarmCacheWorker()
 odds_worker = PrewarmOddsWorker()
@@ -29,6 +38,48 @@ persist_worker = PersistFinishedFixturesWorker()
 persist_h2h_worker = PersistH2HFixturesWorker()
 persist_recent_worker = PersistRecentMatchesWorker()
 live_worker = LiveWorker()
+api_client = SportsAPIClient()
+
+scheduler = AsyncIOScheduler(job_defaults={'max_instances': 1})
+
+
+def _schedule_live_poll():
+    """(Re)schedule the single live-update job at the cadence the match state calls for."""
+    delay = live_worker.next_poll_delay()
+    scheduler.add_job(
+        run_live_poll,
+        DateTrigger(run_date=datetime.now(timezone.utc) + timedelta(seconds=delay)),
+        id='live_update_worker',
+        name='Live Update Worker',
+        replace_existing=True,
+        misfire_grace_time=None,  # a late poll still runs; a dropped one would end the chain
+    )
+    if delay >= 600:
+        logger.info(f"⚽ Next live poll in {delay / 60:.0f} min.")
+
+
+def run_live_poll():
+    try:
+        live_worker.run_live_update()
+    finally:
+        _schedule_live_poll()
+
+
+def _start_job_workers():
+    """Launch the job consumers' supervisor (python -m tasks.job_worker) as a child process."""
+    process = subprocess.Popen(
+        [sys.executable, "-m", "tasks.job_worker"],
+        env={**os.environ, "JOB_WORKER_PARENT_PID": str(os.getpid())},
+    )
+    atexit.register(process.terminate)
+    logger.info(f"🧰 Job consumers started (supervisor pid {process.pid}).")
+
+
+def _has_budget(step: str, reserve: int) -> bool:
+    if api_client.has_budget(reserve):
+        return True
+    logger.warning(f"⛽ Skipping {step}: no more than the {reserve} reserved API requests left today.")
+    return False
 
 
 async def run_nightly_pipeline():
@@ -37,26 +88,38 @@ async def run_nightly_pipeline():
       Phase 1 — Redis/prep: populate caches and in-memory state
       Phase 2 — DB: persist historical data using phase 1 output
     Steps run sequentially; each awaits completion before the next starts.
+
+    The day's API quota (from the rate-limit headers, see utils/api_quota.py)
+    is spent by priority: schedules always run, then odds, then the deep
+    persist jobs. Lower-priority steps never dip into the requests the live
+    worker needs for today's windows; they are skipped, or stop part-way, once
+    only that reserve is left.
     """
     logger.info("🌙 Nightly pipeline starting...")
 
     # Phase 1 — Redis / prep
     await asyncio.to_thread(prewarm_worker.prewarm_match_schedules)
     await asyncio.to_thread(live_worker.calculate_live_windows)
-    await asyncio.to_thread(odds_worker.prewarm_odds)
-    await asyncio.to_thread(scout_worker.prewarm_scout)
+    _schedule_live_poll()  # the new day's windows may start before the pending poll
+    reserve = live_worker.estimated_requests + quota_safety_margin
+    logger.info(f"⛽ Reserving {reserve} API requests for today's live updates.")
+
+    if _has_budget("odds prewarm", reserve):
+        await asyncio.to_thread(odds_worker.prewarm_odds, reserve)
+    await asyncio.to_thread(scout_worker.prewarm_scout)  # Redis + DB only, no API calls
 
     # Phase 2 — DB persist
-    await asyncio.to_thread(persist_recent_worker.persist_recent_matches)
-    await asyncio.to_thread(persist_h2h_worker.persist_h2h_fixtures)
-    await asyncio.to_thread(persist_worker.persist_finished_fixtures)
+    if _has_budget("recent-matches persist", reserve):
+        await asyncio.to_thread(persist_recent_worker.persist_recent_matches, reserve)
+    if _has_budget("H2H persist", reserve):
+        await asyncio.to_thread(persist_h2h_worker.persist_h2h_fixtures, reserve)
+    if _has_budget("finished-fixtures persist", reserve):
+        await asyncio.to_thread(persist_worker.persist_finished_fixtures, None, reserve)
 
     logger.info("🌙 Nightly pipeline complete.")
 
 
 async def main():
-    scheduler = AsyncIOScheduler(job_defaults={'max_instances': 1})
-
     scheduler.add_job(
         run_nightly_pipeline,
         CronTrigger(hour=pipeline_hour, minute=pipeline_minute, timezone='America/Mexico_City'),
@@ -65,20 +128,17 @@ async def main():
         replace_existing=True
     )
 
-    scheduler.add_job(
-        live_worker.run_live_update,
-        IntervalTrigger(minutes=minutes_interval),
-        id='live_update_worker',
-        name='Live Update Worker',
-        replace_existing=True
-    )
-
     logger.info("✅ Orchestrator configuration complete.")
 
     logger.info("Executing initial window calculation...")
     live_worker.calculate_live_windows()
 
+    if start_job_workers:
+        _start_job_workers()
+
+    # The live worker reschedules itself after every poll (see LiveWorker.next_poll_delay).
     scheduler.start()
+    _schedule_live_poll()
 
     try:
         await asyncio.Event().wait()
@@ -1,39 +1,48 @@
-from fastapi import APIRouter, Path, Query
+from fastapi import APIRouter, Path, Query, Request
 from services.baseball_service import BaseballService
+from utils.serializer import json_response
 
 router = APIRouter(prefix="/baseball", tags=["baseball"])
 
 
 @router.get("/schedule")
 def get_schedule(
+    request: Request,
     date: str = Query(..., description="Date in YYYY-MM-DD format"),
     league: str = Query("lmb", description="League: lmb or mlb"),
 ):
-    return BaseballService().get_schedule(date, league)
+    result = BaseballService().get_schedule(date, league, raw=True, if_none_match=request.headers.get("if-none-match"))
+    return json_response(result, request)
 
 
 @router.get("/boxscore/{game_pk}")
 def get_boxscore(
+    request: Request,
     game_pk: int = Path(..., description="MiLB Stats API gamePk"),
 ):
-    return BaseballService().get_boxscore(game_pk)
+    result = BaseballService().get_boxscore(game_pk, raw=True, if_none_match=request.headers.get("if-none-match"))
+    return json_response(result, request)
 
 
 @router.get("/pitcher-stats/{person_id}")
 def get_pitcher_stats(
+    request: Request,
     person_id: int = Path(..., description="MLB Stats API person id"),
     league: str = Query("lmb", description="League: lmb or mlb — determines the sportId used for the stats lookup"),
 ):
-    return BaseballService().get_pitcher_stats(person_id, league)
+    result = BaseballService().get_pitcher_stats(person_id, league, raw=True, if_none_match=request.headers.get("if-none-match"))
+    return json_response(result, request)
 
 
 @router.get("/pitcher-gamelog/{person_id}")
 def get_pitcher_gamelog(
+    request: Request,
     person_id: int = Path(..., description="MLB Stats API person id"),
     league: str = Query("lmb", description="League: lmb or mlb — determines the sportId used for the lookup"),
     seasons: int = Query(5, description="How many seasons back to include (this year + seasons-1 prior)"),
 ):
-    return BaseballService().get_pitcher_game_log(person_id, league, seasons)
+    result = BaseballService().get_pitcher_game_log(person_id, league, seasons, raw=True, if_none_match=request.headers.get("if-none-match"))
+    return json_response(result, request)
 
 
 @router.get("/games-scores")
@@ -1,8 +1,9 @@
-import json
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from sqlalchemy.orm import Session
 from utils.database import get_db
 from utils.redis_client import get_redis_connection
+from utils import serializer
+from utils.versioned_cache import get_versioned
 from services.bet_radar_service import BetRadarService
 
 router = APIRouter(prefix="/bet-radar", tags=["BetRadar"])
@@ -18,13 +19,14 @@ def get_bet_radar_suggestions(
 
 @router.get("/cached")
 def get_cached_bet_radar(
+    request: Request,
     date: str = Query(..., description="YYYY-MM-DD"),
 ):
     """Lee sugerencias pre-computadas del pipeline nocturno desde Redis."""
     r, error = get_redis_connection()
     if r is None:
         raise HTTPException(status_code=503, detail=f"Redis unavailable: {error}")
-    raw = r.get(f"bet_radar:{date}")
-    if raw is None:
+    cached = get_versioned(r, f"bet_radar:{date}", request.headers.get("if-none-match"), envelope=False)
+    if cached is None:
         raise HTTPException(status_code=404, detail=f"No hay BetRadar cacheado para {date}.")
-    return json.loads(raw)
+    return serializer.json_response(cached, request)
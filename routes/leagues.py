@@ -5,6 +5,7 @@ import os
 import models
 import requests
 from utils.constants import HEADERS
+from services.sports_api_client import get_shared_session, CONNECT_TIMEOUT, READ_TIMEOUT
 from sqlalchemy.orm import Session, joinedload
 from typing import List, Optional
 from fastapi import APIRouter, Query, Depends, HTTPException
@@ -86,7 +87,7 @@ def sync_api_leagues(db: Session = Depends(database.get_db), season: Optional[in
   url = f"https://{api_url}/leagues?season={season}"  
 
   try:
-    response = requests.get(url, headers=HEADERS)
+    response = get_shared_session().get(url, headers=HEADERS, timeout=(CONNECT_TIMEOUT, READ_TIMEOUT))
     response.raise_for_status() 
     data = response.json()
 
@@ -1,22 +1,35 @@
-from fastapi import APIRouter, Query, Depends
+import asyncio
+from typing import List, Optional
+
+from fastapi import APIRouter, HTTPException, Query, Depends, Request
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from dotenv import load_dotenv
 from utils import database
 from services.match_service import MatchService
 from services.H2HService import H2HService
+from utils import fixture_events, live_feed, serializer
+from utils.redis_client import get_redis_connection
+from utils.serializer import json_response
 
 load_dotenv()
 
 router = APIRouter(prefix="/matches", tags=["matches"])
 
+LIVE_STREAM_HEARTBEAT = 15  # seconds between keep-alive comments
+
 
 @router.get("/by-date")
 def get_matches_by_date(
+    request: Request,
     date: str = Query(..., description="Date in format YYYY-MM-DD"),
     db: Session = Depends(database.get_db),
 ):
     match_service = MatchService(db)
-    return match_service.get_matches_by_date(date, force_refresh=False)
+    result = match_service.get_matches_by_date(
+        date, force_refresh=False, raw=True, if_none_match=request.headers.get("if-none-match")
+    )
+    return json_response(result, request)
 
 
 @router.get("/headtohead")
@@ -27,3 +40,58 @@ def get_headtohead_matches(
 ):
     h2h_service = H2HService(db)
     return h2h_service.get_headtohead_matches(team1, team2)
+
+
+@router.get("/live/stream")
+async def stream_live_updates(
+    request: Request,
+    fixture_ids: Optional[List[int]] = Query(None, description="Only these fixtures (default: all)"),
+):
+    """
+    Server-Sent Events feed of live fixture changes published by the live worker.
+
+    `event: fixture` carries one delta: fixture_id, date and whichever of
+    status, goals, score, new_events (or the full `events` after a
+    correction) changed. `event: resync` means updates may have been missed:
+    re-pull /matches/by-date, then keep applying deltas.
+    """
+    wanted = set(fixture_ids or [])
+
+    async def events():
+        queue = live_feed.broadcaster.subscribe()
+        try:
+            yield b"retry: 5000\n\n"
+            while not await request.is_disconnected():
+                try:
+                    message = await asyncio.wait_for(queue.get(), LIVE_STREAM_HEARTBEAT)
+                except asyncio.TimeoutError:
+                    yield b": keep-alive\n\n"
+                    continue
+                if message == live_feed.RESYNC:
+                    yield b"event: resync\ndata: {}\n\n"
+                    continue
+                if wanted and serializer.loads(message)["fixture_id"] not in wanted:
+                    continue
+                yield b"event: fixture\ndata: " + message + b"\n\n"
+        finally:
+            live_feed.broadcaster.unsubscribe(queue)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get("/fixture/{fixture_id}/events")
+def get_fixture_events_since(fixture_id: int, since: int = Query(0, ge=0, description="Events already held")):
+    """
+    Events of a fixture from its append-only log, starting at index `since`.
+
+    The log only grows, so pass back `next` to receive just the new events.
+    """
+    r, error = get_redis_connection()
+    if r is None:
+        raise HTTPException(status_code=503, detail=f"Redis connection failed: {error}")
+    events = fixture_events.read_events(r, fixture_id, since)
+    return {"fixture_id": fixture_id, "events": events, "next": since + len(events)}
@@ -1,13 +1,15 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Request
 from services.odds_service import OddsService
+from utils.serializer import json_response
 
 router = APIRouter(prefix="/odds", tags=["odds"])
 odds_service = OddsService()
 
 
 @router.get("/fixture/{fixture_id}")
-def get_fixture_odds(fixture_id: int):
-    return odds_service.get_odds_by_fixture(fixture_id)
+def get_fixture_odds(fixture_id: int, request: Request):
+    result = odds_service.get_odds_by_fixture(fixture_id, raw=True, if_none_match=request.headers.get("if-none-match"))
+    return json_response(result, request)
 
 
 @router.get("/fixture/{fixture_id}/markets")
@@ -1,7 +1,11 @@
-import json
+import re
+import zlib
 from fastapi import APIRouter, HTTPException, Query, Depends
 from sqlalchemy.orm import Session
 from utils.redis_client import get_redis_connection
+from utils import serializer
+from utils import schedule_cache
+from utils.local_cache import INVALIDATION_CHANNEL
 from utils import database
 from services.sports_api_client import SportsAPIClient
 from services.match_service import MatchService
@@ -9,41 +13,166 @@ from services.match_service import MatchService
 router = APIRouter(prefix="/redis", tags=["redis"])
 api_client = SportsAPIClient()
 
+KEYS_PAGE_MAX = 1000
+SCAN_BATCH = 1000
+
+# The day's schedule is a hash + list + version (utils/schedule_cache); either
+# its base key or the hash is shown as the assembled day.
+_SCHEDULE_KEY = re.compile(r"matches:date:(\d{4}-\d{2}-\d{2})(?::fixtures)?")
+# Deleting any of its keys deletes the whole day: a part left behind would be
+# read as a cached (e.g. empty) day.
+_SCHEDULE_PART_KEY = re.compile(r"matches:date:(\d{4}-\d{2}-\d{2})(?::fixtures|:order|:version)?")
+
+# TTL histogram buckets: (upper bound in seconds, label)
+_TTL_BUCKETS = [(60, "<1m"), (3600, "<1h"), (86400, "<1d"), (604800, "<7d")]
+
+
+def _key_family(key: str) -> str:
+    """`fixture_stats:123` -> `fixture_stats:*`: segments with digits are ids/dates."""
+    return ":".join("*" if any(c.isdigit() for c in part) else part for part in key.split(":"))
+
+
+def _ttl_bucket(ttl: int) -> str:
+    if ttl < 0:
+        return "no expiry"
+    return next((label for bound, label in _TTL_BUCKETS if ttl < bound), ">=7d")
+
+
 @router.get("/keys")
-def get_redis_keys():
+def get_redis_keys(
+    pattern: str = Query("*", description="SCAN MATCH pattern, e.g. odds:*"),
+    cursor: int = Query(0, ge=0, description="Cursor from the previous page; 0 starts a new scan"),
+    count: int = Query(100, ge=1, le=KEYS_PAGE_MAX, description="Keys per page (approximate)"),
+):
     """
-    Get all Redis keys
+    Page through Redis keys matching `pattern` with SCAN (KEYS would block Redis).
+
+    Pass the returned `cursor` back for the next page; cursor 0 means the scan
+    is complete. Pages are sorted, the keyspace as a whole is not, and a key
+    can show up on two pages if the keyspace is rehashed mid-scan.
     """
     try:
         r, error = get_redis_connection()
         if r is None:
             return {"error": "Redis connection failed", "details": error}
-        
-        keys = r.keys("*")
-        sorted_keys = sorted(keys)
-        return {"keys": sorted_keys}
+
+        keys = []
+        while True:
+            cursor, batch = r.scan(cursor=cursor, match=pattern, count=count)
+            keys.extend(batch)
+            if cursor == 0 or len(keys) >= count:
+                break
+        sorted_keys = sorted(key.decode("utf-8", errors="replace") for key in keys)
+        return {"keys": sorted_keys, "cursor": cursor, "pattern": pattern}
     except Exception as e:
         return {"error": "Failed to retrieve Redis keys", "details": str(e)}
 
+@router.get("/stats")
+def get_redis_stats(
+    pattern: str = Query("*", description="SCAN MATCH pattern"),
+    sample: int = Query(20, ge=0, le=500, description="Keys per family measured with MEMORY USAGE"),
+):
+    """
+    What is using the cache: per key family (ids/dates collapsed to `*`) the key
+    count, a TTL histogram and MEMORY USAGE of a sample of keys, extrapolated
+    to the family. Built on SCAN + pipelined TTL, so Redis is never blocked.
+    """
+    try:
+        r, error = get_redis_connection()
+        if r is None:
+            return {"error": "Redis connection failed", "details": error}
+
+        families = {}
+        cursor = 0
+        while True:
+            cursor, batch = r.scan(cursor=cursor, match=pattern, count=SCAN_BATCH)
+            keys = [key.decode("utf-8", errors="replace") for key in batch]
+            pipe = r.pipeline(transaction=False)
+            for key in keys:
+                pipe.ttl(key)
+            sampled = []
+            for key in keys:
+                family = families.setdefault(_key_family(key), {"keys": 0, "ttl": {}, "sampled": 0, "sampled_bytes": 0})
+                family["keys"] += 1
+                if family["sampled"] < sample:
+                    family["sampled"] += 1
+                    sampled.append(family)
+                    pipe.memory_usage(key)
+            results = pipe.execute(raise_on_error=False)
+            for key, ttl in zip(keys, results):
+                if isinstance(ttl, int) and ttl != -2:  # -2: expired since SCAN
+                    histogram = families[_key_family(key)]["ttl"]
+                    histogram[_ttl_bucket(ttl)] = histogram.get(_ttl_bucket(ttl), 0) + 1
+            for family, usage in zip(sampled, results[len(keys):]):
+                if isinstance(usage, int):
+                    family["sampled_bytes"] += usage
+                else:  # expired, or MEMORY USAGE unsupported
+                    family["sampled"] -= 1
+            if cursor == 0:
+                break
+
+        report = []
+        for name, family in families.items():
+            avg = family["sampled_bytes"] / family["sampled"] if family["sampled"] else None
+            report.append({
+                "family": name,
+                "keys": family["keys"],
+                "ttl": family["ttl"],
+                "sampled": family["sampled"],
+                "avg_bytes": round(avg) if avg is not None else None,
+                "est_bytes": round(avg * family["keys"]) if avg is not None else None,
+            })
+        report.sort(key=lambda f: (f["est_bytes"] or 0, f["keys"]), reverse=True)
+        return {
+            "pattern": pattern,
+            "keys": sum(f["keys"] for f in report),
+            "est_bytes": sum(f["est_bytes"] or 0 for f in report),
+            "families": report,
+        }
+    except Exception as e:
+        return {"error": "Failed to compute Redis stats", "details": str(e)}
+
+def _decode(value: bytes):
+    """A stored value as JSON when it is serializer-encoded, else as text."""
+    try:
+        return serializer.loads(value)
+    except (ValueError, TypeError, zlib.error):
+        return value.decode("utf-8", errors="replace")
+
+
 @router.get("/get_key_by_id")
 def get_redis_key(key: str):
+    """
+    Decoded value of `key`. Hashes, lists, sets and sorted sets are returned
+    whole; the daily schedule (`matches:date:{date}` or its `:fixtures` hash)
+    as the day's fixtures in schedule order.
+    """
     try:
         r, error = get_redis_connection()
         if r is None:
             raise HTTPException(status_code=500, detail=f"Redis connection failed: {error}")
 
-        raw_value = r.get(key)
+        schedule = _SCHEDULE_KEY.fullmatch(key)
+        if schedule:
+            fixtures = schedule_cache.read_day(r, schedule.group(1))
+            if fixtures is None:
+                raise HTTPException(status_code=404, detail=f"Key '{key}' not found")
+            return fixtures
 
-        if raw_value is None:
+        key_type = r.type(key).decode()
+        if key_type == "none":
             raise HTTPException(status_code=404, detail=f"Key '{key}' not found")
-        
-        if isinstance(raw_value, bytes):
-            raw_value = raw_value.decode("utf-8")
-            
-        try:
-            return json.loads(raw_value)
-        except (json.JSONDecodeError, TypeError):
-            return raw_value
+        if key_type == "string":
+            return _decode(r.get(key))
+        if key_type == "hash":
+            return {field.decode("utf-8", errors="replace"): _decode(value) for field, value in r.hgetall(key).items()}
+        if key_type == "list":
+            return [_decode(value) for value in r.lrange(key, 0, -1)]
+        if key_type == "set":
+            return sorted((_decode(value) for value in r.smembers(key)), key=str)
+        if key_type == "zset":
+            return [[_decode(member), score] for member, score in r.zrange(key, 0, -1, withscores=True)]
+        raise HTTPException(status_code=400, detail=f"Key '{key}' is a {key_type}, which can't be displayed")
 
     except HTTPException as he:
         raise he
@@ -72,8 +201,13 @@ def delete_redis_key(key: str):
         if r is None:
             raise HTTPException(status_code=500, detail=f"Redis connection failed: {error}")
         
-        result = r.delete(key)
-        
+        schedule = _SCHEDULE_PART_KEY.fullmatch(key)
+        if schedule:
+            result = schedule_cache.delete_day(r, schedule.group(1))
+        else:
+            result = r.delete(key)
+            r.publish(INVALIDATION_CHANNEL, "*")  # rare: drop every web worker's in-process tier
+
         if result == 0:
             raise HTTPException(status_code=404, detail=f"Key '{key}' did not exist")
 
@@ -92,6 +226,7 @@ def flush_redis_db():
             raise HTTPException(status_code=500, detail=f"Redis connection failed: {error}")
         
         r.flushdb()
+        r.publish(INVALIDATION_CHANNEL, "*")
         return {"message": "Redis database flushed successfully"}
     except HTTPException as he:
         raise he
@@ -1,6 +1,11 @@
 import os
 import requests
 from fastapi import APIRouter, HTTPException
+from services.sports_api_client import get_shared_session, CONNECT_TIMEOUT
+from utils.api_quota import get_quota
+from utils.redis_client import get_redis_connection
+from utils import job_queue
+from utils import live_stats
 
 router = APIRouter(prefix="/status", tags=["status"])
 
@@ -23,7 +28,7 @@ def get_api_usage():
     }
 
     try:
-        response = requests.get(url, headers=headers, timeout=10)
+        response = get_shared_session().get(url, headers=headers, timeout=(CONNECT_TIMEOUT, 10))
         response.raise_for_status()
         req = response.json().get("response", {}).get("requests", {})
 
@@ -45,3 +50,35 @@ def get_api_usage():
             status_code=500,
             detail=f"Failed to reach external API: {str(e)}",
         )
+
+
+@router.get("/quota")
+def get_recorded_quota():
+    """Quota from the rate-limit headers of the last API-Sports response.
+
+    Unlike /usage this costs no upstream call.
+    """
+    return {"quota": get_quota()}
+
+
+@router.get("/live-worker")
+def get_live_worker_stats():
+    """Changed vs unchanged live fixtures: last tick and running totals.
+
+    The totals cover every tick since the worker last went a full day without
+    one (the counters' TTL is refreshed by each tick). writes_skipped counts
+    ticks where nothing changed, so the schedule wasn't written.
+    """
+    r, error = get_redis_connection()
+    if r is None:
+        raise HTTPException(status_code=503, detail=f"Redis connection failed: {error}")
+    return live_stats.get_tick_stats(r)
+
+
+@router.get("/jobs")
+def get_job_queue_stats():
+    """Post-match job queue: jobs waiting, claimed or awaiting a retry, and dead-lettered."""
+    r, error = get_redis_connection()
+    if r is None:
+        raise HTTPException(status_code=503, detail=f"Redis connection failed: {error}")
+    return job_queue.stats(r)
@@ -0,0 +1,86 @@
+"""Per-call latency of SportsAPIClient: one-off requests.get vs the shared pooled session.
+
+Runs against a local keep-alive stub server, so it isolates connection setup
+cost (TCP only here — against the real API each fresh connection also pays a
+TLS handshake, so the production gap is wider than what this prints).
+
+Usage (from the repo root):
+  python -m scripts.bench_api_transport [calls]
+"""
+import statistics
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+from services.sports_api_client import SportsAPIClient, CONNECT_TIMEOUT, READ_TIMEOUT
+
+_BODY = b'{"response": [{"fixture": {"id": 1}}]}'
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+  protocol_version = "HTTP/1.1"  # keep-alive, like the real API
+  disable_nagle_algorithm = True  # headers + body go out as separate writes
+
+  def do_GET(self):
+    self.send_response(200)
+    self.send_header("Content-Type", "application/json")
+    self.send_header("Content-Length", str(len(_BODY)))
+    self.end_headers()
+    self.wfile.write(_BODY)
+
+  def log_message(self, *args):
+    pass
+
+
+class _NoLimit:
+  """Benchmark measures transport only, not the API rate limiter."""
+
+  def acquire(self):
+    return True
+
+
+def _time_calls(fn, calls: int) -> list[float]:
+  timings = []
+  for _ in range(calls):
+    start = time.perf_counter()
+    fn()
+    timings.append((time.perf_counter() - start) * 1000)
+  return timings
+
+
+def _report(label: str, timings: list[float]):
+  timings = sorted(timings)
+  p95 = timings[int(len(timings) * 0.95) - 1]
+  print(f"{label:<22} mean {statistics.mean(timings):6.3f} ms | p50 {statistics.median(timings):6.3f} ms | p95 {p95:6.3f} ms")
+
+
+def main(calls: int = 500):
+  server = ThreadingHTTPServer(("127.0.0.1", 0), _StubHandler)
+  threading.Thread(target=server.serve_forever, daemon=True).start()
+  base_url = f"http://127.0.0.1:{server.server_port}"
+
+  client = SportsAPIClient(base_url=base_url)
+  client.rate_limiter = _NoLimit()
+
+  def before():
+    # Old behaviour: module-level requests.get, new connection per call.
+    response = requests.get(f"{base_url}/fixtures/statistics", headers=client.headers,
+                            params={"fixture": 1}, timeout=(CONNECT_TIMEOUT, READ_TIMEOUT))
+    response.raise_for_status()
+    return response.json().get("response", [])
+
+  def after():
+    return client.get_fixture_statistics(1)
+
+  before(); after()  # warm-up
+  print(f"{calls} calls against {base_url}")
+  _report("before (requests.get)", _time_calls(before, calls))
+  _report("after (pooled)", _time_calls(after, calls))
+  server.shutdown()
+
+
+if __name__ == "__main__":
+  main(int(sys.argv[1]) if len(sys.argv) > 1 else 500)
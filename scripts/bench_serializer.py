@@ -0,0 +1,111 @@
+"""Encode/decode cost of a `matches:date:*` payload: stdlib json vs utils.serializer.
+
+The payload mimics a busy match day in the cache: fixtures from favourite
+leagues with teams, scores and a full event list merged in by the live worker.
+Also compares the /matches/by-date cache-hit path before (json.loads, then
+FastAPI's default jsonable_encoder + json.dumps) and after (raw bytes wrapped
+in `{"data": ...}` with a content ETag), with and without the compressed
+storage envelope.
+
+Usage (from the repo root):
+  python -m scripts.bench_serializer [fixtures] [rounds]
+"""
+import json
+import random
+import statistics
+import sys
+import time
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from utils import serializer
+
+
+def _event(minute: int, team: dict) -> dict:
+  return {
+    "time": {"elapsed": minute, "extra": None},
+    "team": team,
+    "player": {"id": random.randint(1000, 99999), "name": "Jugador Ejemplo"},
+    "assist": {"id": None, "name": None},
+    "type": random.choice(["Goal", "Card", "subst"]),
+    "detail": random.choice(["Normal Goal", "Yellow Card", "Substitution 1"]),
+    "comments": None,
+  }
+
+
+def _fixture(fixture_id: int) -> dict:
+  home = {"id": random.randint(1, 5000), "name": "Club América", "logo": "https://media.api-sports.io/football/teams/1.png"}
+  away = {"id": random.randint(1, 5000), "name": "Cruz Azul", "logo": "https://media.api-sports.io/football/teams/2.png"}
+  return {
+    "fixture": {
+      "id": fixture_id,
+      "referee": "César Ramos",
+      "timezone": "America/Mexico_City",
+      "date": "2026-10-18T19:00:00-06:00",
+      "timestamp": 1792371600,
+      "periods": {"first": 1792371600, "second": 1792375200},
+      "venue": {"id": 1, "name": "Estadio Azteca", "city": "Ciudad de México"},
+      "status": {"long": "Match Finished", "short": "FT", "elapsed": 90, "extra": None},
+    },
+    "league": {"id": 262, "name": "Liga MX", "country": "Mexico", "logo": "", "flag": "", "season": 2026, "round": "Apertura - 13"},
+    "teams": {"home": {**home, "winner": True}, "away": {**away, "winner": False}},
+    "goals": {"home": 2, "away": 1},
+    "score": {
+      "halftime": {"home": 1, "away": 0},
+      "fulltime": {"home": 2, "away": 1},
+      "extratime": {"home": None, "away": None},
+      "penalty": {"home": None, "away": None},
+    },
+    "events": [_event(random.randint(1, 90), random.choice([home, away])) for _ in range(15)],
+  }
+
+
+def _time(fn, rounds: int) -> list[float]:
+  timings = []
+  for _ in range(rounds):
+    start = time.perf_counter()
+    fn()
+    timings.append((time.perf_counter() - start) * 1000)
+  return timings
+
+
+def _report(label: str, timings: list[float]):
+  print(f"{label:<34} mean {statistics.mean(timings):8.3f} ms | p50 {statistics.median(timings):8.3f} ms")
+
+
+def main(fixtures: int = 300, rounds: int = 50):
+  random.seed(0)
+  payload = [_fixture(1_000_000 + i) for i in range(fixtures)]
+  stdlib_raw = json.dumps(payload)
+  raw = serializer.dumps(payload, compress=False)
+  packed = serializer.dumps(payload)
+  backend = "orjson" if serializer.orjson else "stdlib fallback"
+  print(f"{fixtures} fixtures, {len(stdlib_raw) / 1024:.0f} KB (json) / {len(raw) / 1024:.0f} KB ({backend})"
+        f" / {len(packed) / 1024:.0f} KB (compressed), {rounds} rounds")
+
+  _report("dumps  json", _time(lambda: json.dumps(payload), rounds))
+  _report("dumps  serializer", _time(lambda: serializer.dumps(payload, compress=False), rounds))
+  _report("dumps  serializer compressed", _time(lambda: serializer.dumps(payload), rounds))
+  _report("loads  json", _time(lambda: json.loads(stdlib_raw), rounds))
+  _report("loads  serializer", _time(lambda: serializer.loads(raw), rounds))
+  _report("loads  serializer compressed", _time(lambda: serializer.loads(packed), rounds))
+
+  def route_before():
+    return JSONResponse(jsonable_encoder({"data": json.loads(stdlib_raw)})).body
+
+  def route_after():
+    return serializer.json_response(serializer.data_envelope(raw)).body
+
+  def route_after_compressed():
+    return serializer.json_response(serializer.data_envelope(serializer.unpack(packed))).body
+
+  assert json.loads(route_before()) == json.loads(route_after()) == json.loads(route_after_compressed())
+  _report("cache hit route  before", _time(route_before, rounds))
+  _report("cache hit route  after", _time(route_after, rounds))
+  _report("cache hit route  after, compressed", _time(route_after_compressed, rounds))
+
+
+if __name__ == "__main__":
+  args = [int(a) for a in sys.argv[1:3]]
+  main(*args)
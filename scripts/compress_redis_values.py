@@ -0,0 +1,97 @@
+"""Migrate existing plain-JSON Redis values to the compressed envelope and report savings.
+
+New writes are compressed by utils.serializer.dumps already; this rewrites keys
+stored before that, in place, keeping their TTL (and their etag:{key} version
+when the key has one). Without --apply it only measures what would be saved.
+Sizes are value bytes; Redis adds a small fixed overhead per key on top.
+
+Usage (from the repo root):
+  python -m scripts.compress_redis_values [--apply]
+"""
+import sys
+
+import redis
+
+from utils import serializer
+from utils.redis_client import get_redis_connection
+from utils.versioned_cache import version_key
+
+FAMILIES = [
+  "matches:date:*",
+  "team_recent_matches:*",
+  "fixture_stats:*",
+  "fixture_events:*",
+  "fixture_lineups:*",
+  "fixture_player_stats:*",
+  "h2h:teams:*",
+  "bet_radar:*",
+  "odds:*",
+  "api_cache:*",
+  "baseball:*",
+]
+
+
+def _rewrite(r, key: bytes, original: bytes, packed: bytes) -> bool:
+  """Replace `key` with `packed` unless a writer changed it since we read it."""
+  with r.pipeline() as pipe:
+    try:
+      pipe.watch(key)
+      if pipe.get(key) != original:
+        return False
+      has_version = pipe.exists(version_key(key.decode()))
+      pipe.multi()
+      pipe.set(key, packed, keepttl=True)
+      if has_version:
+        pipe.set(version_key(key.decode()), serializer.content_etag(packed), keepttl=True)
+      pipe.execute()
+      return True
+    except redis.WatchError:
+      return False
+
+
+def migrate(apply: bool = False):
+  r, error = get_redis_connection()
+  if r is None:
+    print(f"Redis unavailable: {error}")
+    return
+
+  print(f"{'family':<24} {'keys':>6} {'plain KB':>10} {'after KB':>10} {'saved':>7}")
+  total_before = total_after = 0
+  for pattern in FAMILIES:
+    keys = before = after = 0
+    for key in r.scan_iter(match=pattern, count=500):
+      if key.startswith(b"etag:"):
+        continue
+      try:
+        value = r.get(key)
+      except redis.ResponseError:  # not a string key
+        continue
+      if value is None:
+        continue
+      keys += 1
+      if serializer.is_packed(value):
+        before += len(serializer.unpack(value))
+        after += len(value)
+        continue
+      before += len(value)
+      if len(value) < serializer.COMPRESS_MIN_BYTES:
+        after += len(value)
+        continue
+      packed = serializer.pack(value)
+      if apply and not _rewrite(r, key, value, packed):
+        after += len(value)  # changed under us; its writer stores it compressed anyway
+        continue
+      after += len(packed)
+
+    total_before += before
+    total_after += after
+    saved = f"{100 * (1 - after / before):.0f}%" if before else "-"
+    print(f"{pattern:<24} {keys:>6} {before / 1024:>10.0f} {after / 1024:>10.0f} {saved:>7}")
+
+  saved = f"{100 * (1 - total_after / total_before):.0f}%" if total_before else "-"
+  print(f"{'total':<24} {'':>6} {total_before / 1024:>10.0f} {total_after / 1024:>10.0f} {saved:>7}")
+  print("Values rewritten." if apply else "Dry run: nothing written (pass --apply to migrate).")
+
+
+if __name__ == "__main__":
+  migrate(apply="--apply" in sys.argv[1:])
@@ -0,0 +1,95 @@
+import asyncio
+import functools
+import os
+from concurrent.futures import ThreadPoolExecutor
+from dotenv import load_dotenv
+from services.sports_api_client import SportsAPIClient, POOL_SIZE
+
+load_dotenv()
+
+# In-flight requests at once; more than the shared session's pool would only queue on it.
+ASYNC_CONCURRENCY = min(int(os.getenv("API_ASYNC_CONCURRENCY", 10)), POOL_SIZE)
+
+
+class AsyncSportsAPIClient:
+  """asyncio face of SportsAPIClient with bounded concurrency.
+
+  Every call runs SportsAPIClient's own method in a worker thread, so the API
+  response cache, quota tracking, the shared rate limiter, the streamed league
+  filter and the retry policy are exactly the sync client's; at most
+  `concurrency` calls are in flight at once. Lets a caller `asyncio.gather`
+  hundreds of fetches (see fan_out) instead of walking them one by one.
+  Use as `async with AsyncSportsAPIClient() as client:` or call `close()`.
+  """
+
+  def __init__(self, concurrency: int = None, api_client: SportsAPIClient = None):
+    concurrency = concurrency or ASYNC_CONCURRENCY
+    self.api_client = api_client or SportsAPIClient()
+    self.semaphore = asyncio.Semaphore(concurrency)
+    # Own threads: the loop's default executor is sized by CPU count, not by `concurrency`.
+    self.executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="api-async")
+
+  async def __aenter__(self):
+    return self
+
+  async def __aexit__(self, *exc):
+    self.close()
+
+  def close(self):
+    self.executor.shutdown(wait=False)
+
+  async def _call(self, method, *args):
+    async with self.semaphore:
+      return await asyncio.get_running_loop().run_in_executor(self.executor, functools.partial(method, *args))
+
+  async def get_fixtures_by_date(self, date: str, league_ids: set = None, max_age: int = None):
+    return await self._call(self.api_client.get_fixtures_by_date, date, league_ids, max_age)
+
+  async def get_fixtures_by_ids(self, fixture_ids: list[int]):
+    return await self._call(self.api_client.get_fixtures_by_ids, fixture_ids)
+
+  async def get_team_last_matches(self, team_id: int, last: int = 10, max_age: int = None):
+    return await self._call(self.api_client.get_team_last_matches, team_id, last, max_age)
+
+  async def get_fixture_statistics(self, fixture_id: int):
+    return await self._call(self.api_client.get_fixture_statistics, fixture_id)
+
+  async def get_fixture_events(self, fixture_id: int):
+    return await self._call(self.api_client.get_fixture_events, fixture_id)
+
+  async def get_live_fixtures(self, league_ids: set = None):
+    return await self._call(self.api_client.get_live_fixtures, league_ids)
+
+  async def get_headtohead_matches(self, team1: int, team2: int, last: int = 10, max_age: int = None):
+    return await self._call(self.api_client.get_headtohead_matches, team1, team2, last, max_age)
+
+  async def get_fixture_lineups(self, fixture_id: int):
+    return await self._call(self.api_client.get_fixture_lineups, fixture_id)
+
+  async def get_fixture_player_statistics(self, fixture_id: int):
+    return await self._call(self.api_client.get_fixture_player_statistics, fixture_id)
+
+  async def get_odds_by_fixture(self, fixture_id: int):
+    return await self._call(self.api_client.get_odds_by_fixture, fixture_id)
+
+
+def fan_out(method_name: str, calls: list, reserve: int = 0, concurrency: int = None) -> tuple[list, bool]:
+  """Run `AsyncSportsAPIClient.<method_name>(*args)` for every args tuple in `calls`, concurrently.
+
+  For the sync workers (it runs its own event loop). Calls go out in rounds
+  of `concurrency`; before each round the day's quota must be above
+  `reserve`, else the rest is skipped. Returns (results in call order,
+  stopped_early).
+  """
+  async def run():
+    size = concurrency or ASYNC_CONCURRENCY
+    async with AsyncSportsAPIClient(size) as client:
+      method = getattr(client, method_name)
+      results = []
+      for start in range(0, len(calls), size):
+        if not client.api_client.has_budget(reserve):
+          return results, True
+        results += await asyncio.gather(*(method(*args) for args in calls[start:start + size]))
+      return results, False
+
+  return asyncio.run(run())
@@ -1,6 +1,8 @@
-import json
 from datetime import datetime
 from utils.redis_client import get_redis_connection
+from utils import serializer
+from utils.versioned_cache import get_versioned, set_versioned
+from utils.cache_batch import get_many, set_many
 from services.mlb_api_client import MLBApiClient
 
 SCHEDULE_TTL = 120     # 2 min — live scores change frequently
@@ -11,47 +13,60 @@ FINAL_SCORE_TTL = 604800  # 7d — a completed game's score never changes
 
 
 class BaseballService:
+    """Cached MLB Stats API lookups. Getters take `raw=True` (and optionally
+    `if_none_match`) to return a cache hit as an EncodedPayload for routes to
+    pass through untouched (see MatchService).
+    """
+
     def __init__(self):
         self.client = MLBApiClient()
         self.r, _ = get_redis_connection()
 
-    def get_schedule(self, date: str, league: str = "lmb", force_refresh: bool = False) -> dict:
+    def _read_cached(self, cache_key: str, raw: bool, if_none_match: str = None):
+        if raw:
+            return get_versioned(self.r, cache_key, if_none_match) if self.r else None
+        cached = self.r.get(cache_key) if self.r else None
+        return {"data": serializer.loads(cached)} if cached else None
+
+    def get_schedule(self, date: str, league: str = "lmb", force_refresh: bool = False, raw: bool = False,
+                     if_none_match: str = None) -> dict | serializer.EncodedPayload:
         cache_key = f"baseball:{league}:{date}"
-        if not force_refresh and self.r:
-            cached = self.r.get(cache_key)
+        if not force_refresh:
+            cached = self._read_cached(cache_key, raw, if_none_match)
             if cached:
-                return {"data": json.loads(cached)}
+                return cached
 
         games = self.client.get_schedule(date, league)
         if self.r and games is not None:
-            self.r.setex(cache_key, SCHEDULE_TTL, json.dumps(games))
+            set_versioned(self.r, cache_key, serializer.dumps(games), SCHEDULE_TTL)
         return {"data": games}
 
-    def get_boxscore(self, game_pk: int) -> dict:
+    def get_boxscore(self, game_pk: int, raw: bool = False,
+                     if_none_match: str = None) -> dict | serializer.EncodedPayload:
         cache_key = f"baseball:boxscore:{game_pk}"
-        if self.r:
-            cached = self.r.get(cache_key)
-            if cached:
-                return {"data": json.loads(cached)}
+        cached = self._read_cached(cache_key, raw, if_none_match)
+        if cached:
+            return cached
 
         box = self.client.get_boxscore(game_pk)
         if self.r and box:
-            self.r.setex(cache_key, BOXSCORE_TTL, json.dumps(box))
+            set_versioned(self.r, cache_key, serializer.dumps(box), BOXSCORE_TTL)
         return {"data": box}
 
-    def get_pitcher_stats(self, person_id: int, league: str = "lmb") -> dict:
+    def get_pitcher_stats(self, person_id: int, league: str = "lmb", raw: bool = False,
+                          if_none_match: str = None) -> dict | serializer.EncodedPayload:
         cache_key = f"baseball:pitcher-stats:{league}:{person_id}"
-        if self.r:
-            cached = self.r.get(cache_key)
-            if cached:
-                return {"data": json.loads(cached)}
+        cached = self._read_cached(cache_key, raw, if_none_match)
+        if cached:
+            return cached
 
         stats = self.client.get_person_stats(person_id, league)
         if self.r and stats:
-            self.r.setex(cache_key, PITCHER_STATS_TTL, json.dumps(stats))
+            set_versioned(self.r, cache_key, serializer.dumps(stats), PITCHER_STATS_TTL)
         return {"data": stats}
 
-    def get_pitcher_game_log(self, person_id: int, league: str = "lmb", seasons: int = 5) -> dict:
+    def get_pitcher_game_log(self, person_id: int, league: str = "lmb", seasons: int = 5, raw: bool = False,
+                             if_none_match: str = None) -> dict | serializer.EncodedPayload:
         # seasons=5 → this year plus the 4 prior, e.g. 2022-2026. One cache
         # entry per (league, person, seasons) combo so a "just this year" caller
         # and a "5-year history" caller don't fight over the same key.
@@ -59,28 +74,29 @@ class BaseballService:
         years = list(range(current_year, current_year - seasons, -1))
 
         cache_key = f"baseball:pitcher-gamelog:{league}:{person_id}:{seasons}"
-        if self.r:
-            cached = self.r.get(cache_key)
-            if cached:
-                return {"data": json.loads(cached)}
+        cached = self._read_cached(cache_key, raw, if_none_match)
+        if cached:
+            return cached
 
         log = self.client.get_person_game_log(person_id, league, years)
         if self.r and log:
-            self.r.setex(cache_key, GAME_LOG_TTL, json.dumps(log))
+            set_versioned(self.r, cache_key, serializer.dumps(log), GAME_LOG_TTL)
         return {"data": log}
 
     def get_games_final_scores(self, game_pks: list[int]) -> dict:
-        scores = {}
-        for game_pk in game_pks:
-            cache_key = f"baseball:final-score:{game_pk}"
-            cached = self.r.get(cache_key) if self.r else None
-            if cached:
-                scores[game_pk] = json.loads(cached)
+        keys = {game_pk: f"baseball:final-score:{game_pk}" for game_pk in game_pks}
+        cached = get_many(self.r, keys.values()) if self.r else {}
+
+        scores, fetched = {}, {}
+        for game_pk, cache_key in keys.items():
+            if cache_key in cached:
+                scores[game_pk] = cached[cache_key]
                 continue
 
             score = self.client.get_game_final_score(game_pk)
             if score:
                 scores[game_pk] = score
-                if self.r:
-                    self.r.setex(cache_key, FINAL_SCORE_TTL, json.dumps(score))
+                fetched[cache_key] = score
+        if self.r:
+            set_many(self.r, fetched, FINAL_SCORE_TTL)
         return scores
@@ -1,13 +1,16 @@
-import json
 from sqlalchemy.orm import Session
 from utils.redis_client import get_redis_connection
+from utils import schedule_cache
+from utils.local_cache import read_through
+from utils.single_flight import single_flight
 from services.sports_api_client import SportsAPIClient
 from tasks.filters import is_youth_match
 import models
 
 
 class MatchService:
-    """Serves the `matches:date:{YYYY-MM-DD}` Redis cache the frontend polls.
+    """Serves the `matches:date:{YYYY-MM-DD}` Redis cache the frontend polls
+    (a per-fixture hash + order index, see utils/schedule_cache).
 
     Populated nightly by the prewarm worker and kept fresh during the day by
     `tasks/live_matches.py`. This service only talks to Redis + the live API —
@@ -22,55 +25,88 @@ class MatchService:
       self.api_client = SportsAPIClient()
       self.r, _ = get_redis_connection()
 
-    def get_matches_by_date(self, target_date: str, force_refresh: bool = False):
+    def get_matches_by_date(self, target_date: str, force_refresh: bool = False, raw: bool = False,
+                            if_none_match: str = None):
       """Return matches for target_date (YYYY-MM-DD, local calendar day).
 
       Serves straight from Redis on a cache hit. On a miss, or when
-      force_refresh is True, delegates to _refresh_from_api.
+      force_refresh is True, delegates to _refresh_from_api — coalesced per
+      cache key, so concurrent misses (across threads and uvicorn workers)
+      wait on one upstream fetch instead of each calling the API.
+
+      raw: return a cache hit as an EncodedPayload (`{"data": [...]}` bytes
+      plus the stored ETag) for routes that pass it straight to the client
+      (serializer.json_response). With a matching `if_none_match` its body is
+      None and the payload is never read. Raw hits are served from the
+      in-process tier (utils/local_cache) when this worker has a fresh copy.
       """
-      cache_key = f"matches:date:{target_date}"
+      cache_key = schedule_cache.day_key(target_date)
 
-      if not force_refresh and self.r and self.r.exists(cache_key):
-        cached_data = self.r.get(cache_key)
-        if cached_data:
-          return {"data": json.loads(cached_data)}
+      def read_cached():
+        if not self.r:
+          return None
+        cached_data = schedule_cache.read_day(self.r, target_date)
+        return {"data": cached_data} if cached_data is not None else None
+
+      if not force_refresh:
+        if raw and self.r:
+          cached = read_through(
+            cache_key, if_none_match, lambda inm: schedule_cache.read_day_raw(self.r, target_date, inm)
+          )
+        else:
+          cached = read_cached()
+        if cached:
+          return cached
 
-      return self._refresh_from_api(target_date, cache_key)
+      # Followers get the leader's result, so the flight always yields the plain
+      # {"data": [...]} dict, whichever form (raw or not) each caller asked for;
+      # a forced refresh has its own flight and never takes a non-forced result.
+      return single_flight(
+        f"{cache_key}:force" if force_refresh else cache_key,
+        lambda: self._refresh_from_api(target_date, max_age=0 if force_refresh else None),
+        read_cached=None if force_refresh else read_cached,
+        r=self.r,
+      )
 
-    def _refresh_from_api(self, target_date: str, cache_key: str):
+    def _refresh_from_api(self, target_date: str, max_age: int = None):
       """Fetch fixtures live, filter to favorite leagues, merge in any events
       already cached by the live worker, and rewrite the Redis cache.
 
-      TODO: no retry/backoff on API failure — SportsAPIClient swallows errors
-      and returns [], so a transient API outage looks identical to "no
-      matches today" and silently overwrites a previously-good cache (see H1
-      / H3 in CLAUDE.md).
+      max_age=0 (force_refresh) skips the API response cache, whose copy of
+      today's feed may be up to FIXTURES_TODAY_MAX_AGE old.
+
+      If the API call fails (after SportsAPIClient's own retries) the last good
+      cached payload is served as-is and the cache is left untouched, so an
+      outage never looks like "no matches today".
       TODO: postponed/cancelled fixtures outside the live-tracking window
       (calculate_live_windows) never get their status refreshed mid-day —
       nothing currently detects a PST/CANC transition until the next nightly
       prewarm or a manual force_refresh.
       """
-      all_matches = self.api_client.get_fixtures_by_date(target_date)
-
       favorite_leagues = self.db.query(models.League).filter(models.League.is_favorite == True).all()
       favorite_ids = {league.id for league in favorite_leagues}
 
-      filtered_matches = [
-          m for m in all_matches
-          if m.get("league", {}).get("id") in favorite_ids
-          and not is_youth_match(m)
-      ]
+      # Non-favorite leagues are dropped while the (global) response streams in.
+      all_matches = self.api_client.get_fixtures_by_date(target_date, league_ids=favorite_ids, max_age=max_age)
+      if not all_matches.ok:
+        cached_data = schedule_cache.read_day(self.r, target_date) if self.r else None
+        if cached_data:
+          print(f"[MATCHES] ⚠️ API failed for {target_date} ({all_matches.error}). Serving last good cache.")
+          return {"data": cached_data}
+        return {"data": []}
+
+      filtered_matches = [m for m in all_matches if not is_youth_match(m)]
 
       if self.r:
-        # Preserve events merged by the live worker
-        existing_raw = self.r.get(cache_key)
-        if existing_raw:
-          existing_by_id = {m["fixture"]["id"]: m for m in json.loads(existing_raw)}
-          for match in filtered_matches:
-            fid = match["fixture"]["id"]
-            if fid in existing_by_id and existing_by_id[fid].get("events"):
-              match["events"] = existing_by_id[fid]["events"]
-
-        self.r.setex(cache_key, 432000, json.dumps(filtered_matches))
-
-      return {"data": filtered_matches}
\ No newline at end of file
+        # Preserve events merged by the live worker, even one merging right now
+        filtered_matches = schedule_cache.replace_day(
+          self.r, target_date, filtered_matches, schedule_cache.SCHEDULE_TTL, _keep_events
+        )
+
+      return {"data": filtered_matches}
+
+
+def _keep_events(match: dict, stored: dict) -> dict:
+  if stored.get("events"):
+    match["events"] = stored["events"]
+  return match
\ No newline at end of file
@@ -1,5 +1,8 @@
-import json
 from utils.redis_client import get_redis_connection
+from utils import serializer
+from utils.versioned_cache import get_versioned, set_versioned
+from utils.single_flight import single_flight
+from utils.local_cache import read_through
 from services.sports_api_client import SportsAPIClient
 
 ODDS_TTL = 86400  # 24 hours
@@ -20,21 +23,34 @@ class OddsService:
             ]
         return data
 
-    def get_odds_by_fixture(self, fixture_id: int):
+    def get_odds_by_fixture(self, fixture_id: int, raw: bool = False, if_none_match: str = None):
+        """raw / if_none_match: return a cache hit as an EncodedPayload (see MatchService)."""
         cache_key = f"odds:{fixture_id}"
 
-        if self.r:
-            cached = self.r.get(cache_key)
-            if cached:
-                return {"data": json.loads(cached)}
+        def read_cached():
+            cached = self.r.get(cache_key) if self.r else None
+            return {"data": serializer.loads(cached)} if cached else None
 
+        if raw and self.r:
+            cached = read_through(cache_key, if_none_match, lambda inm: get_versioned(self.r, cache_key, inm))
+        else:
+            cached = read_cached()
+        if cached:
+            return cached
+
+        # Concurrent misses for the same fixture share one upstream call. Followers
+        # get the leader's result, so the flight always yields the plain
+        # {"data": [...]} dict, whichever form (raw or not) each caller asked for.
+        return single_flight(cache_key, lambda: self._fetch_odds(fixture_id, cache_key), read_cached, self.r)
+
+    def _fetch_odds(self, fixture_id: int, cache_key: str):
         data = self.api_client.get_odds_by_fixture(fixture_id)
 
         if data:
             data = self._filter_bookmakers(data)
 
         if self.r and data:
-            self.r.setex(cache_key, ODDS_TTL, json.dumps(data))
+            set_versioned(self.r, cache_key, serializer.dumps(data), ODDS_TTL)
 
         return {"data": data}
 
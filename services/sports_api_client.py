@@ -1,112 +1,303 @@
+import hashlib
 import os
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
 import requests
+import urllib3
+from requests.adapters import HTTPAdapter
+from dotenv import load_dotenv
 from utils.constants import HEADERS
+from utils.rate_limiter import get_api_rate_limiter
+from utils.api_quota import record_quota, get_remaining_today
+from utils.api_cache import get_api_response_cache, cache_max_age
+
+try:
+  import ijson
+except ImportError:  # optional: without it filtered calls parse the full body, then filter
+  ijson = None
+
+# Failures while reading a streamed body: dropped connection or truncated JSON.
+_STREAM_ERRORS = (urllib3.exceptions.HTTPError,) + ((ijson.JSONError,) if ijson else ())
+
+load_dotenv()
+
+POOL_SIZE       = int(os.getenv("API_POOL_SIZE", 10))
+CONNECT_TIMEOUT = float(os.getenv("API_CONNECT_TIMEOUT", 5))
+READ_TIMEOUT    = float(os.getenv("API_READ_TIMEOUT", 30))
+MAX_RETRIES     = int(os.getenv("API_MAX_RETRIES", 3))
+BACKOFF_BASE    = float(os.getenv("API_BACKOFF_BASE", 1))   # seconds
+BACKOFF_MAX     = float(os.getenv("API_BACKOFF_MAX", 30))   # seconds
+FIXTURE_IDS_BATCH = 20  # max ids API-Sports accepts in one /fixtures?ids= call
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_shared_session() -> requests.Session:
+  """Process-wide keep-alive session for API-Sports.
+
+  Every SportsAPIClient (workers, routes, services built per request) shares
+  this one connection pool, so repeat calls reuse an open TCP+TLS connection
+  instead of handshaking each time. Created lazily on first use.
+  """
+  global _session
+  if _session is None:
+    with _session_lock:
+      if _session is None:
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        session.headers.update({"Connection": "keep-alive"})
+        _session = session
+  return _session
+
+
+class APIResult(list):
+  """The `response` list of an API call, plus whether the call succeeded.
+
+  It is still a plain list for every existing caller (`if not data`, iteration,
+  json.dumps), but `ok` is False when the request failed after all retries, so
+  callers that care can tell "the API said nothing" apart from "the API was down".
+  """
+
+  def __init__(self, items=(), error: str = None):
+    super().__init__(items)
+    self.error = error
+
+  @property
+  def ok(self) -> bool:
+    return self.error is None
+
+
+def backoff_delay(attempt: int, retry_after: str = None) -> float:
+  """Full-jitter exponential backoff, never shorter than a Retry-After header."""
+  delay = random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * 2 ** attempt))
+  if retry_after:
+    try:
+      wait = float(retry_after)
+    except ValueError:
+      try:
+        wait = parsedate_to_datetime(retry_after).timestamp() - time.time()
+      except (TypeError, ValueError):
+        wait = 0
+    delay = max(delay, min(wait, BACKOFF_MAX))
+  return delay
+
+
+def classify_response(status_code: int, body: dict = None) -> tuple[str | None, bool]:
+  """Return (error, retryable) for an API-Sports response; error is None on success.
+
+  API-Sports reports some failures (quota, bad token) as HTTP 200 with a
+  non-empty `errors` field, so the body is checked as well as the status.
+  """
+  if status_code == 429 or status_code >= 500:
+    return f"HTTP {status_code}", True
+  if status_code >= 400:
+    return f"HTTP {status_code}", False
+  errors = (body or {}).get("errors")
+  if errors:
+    return f"API errors: {errors}", isinstance(errors, dict) and "rateLimit" in errors
+  return None, False
+
+
+class _HeadRecorder:
+  """File-like wrapper that keeps the first `limit` bytes read through it."""
+
+  def __init__(self, raw, limit: int = 65536):
+    self.raw = raw
+    self.limit = limit
+    self.head = bytearray()
+
+  def read(self, size: int = -1) -> bytes:
+    chunk = self.raw.read(size)
+    if len(self.head) < self.limit:
+      self.head += chunk[:self.limit - len(self.head)]
+    return chunk
+
+
+def parse_league_filtered(stream, league_ids: set) -> dict:
+  """Incrementally parse an API-Sports body, keeping only `response` items
+  whose league.id is in `league_ids`.
+
+  Items are decoded one at a time by ijson's C backend and non-matching ones
+  are dropped immediately, so peak memory tracks the filtered result rather
+  than the global feed. `errors` precedes `response` in every API-Sports body,
+  so it is read back from the first bytes of the stream afterwards.
+  Returns {"errors": ..., "response": [...]}.
+  """
+  recorder = _HeadRecorder(stream)
+  kept = [
+    f for f in ijson.items(recorder, "response.item", use_float=True)
+    if f.get("league", {}).get("id") in league_ids
+  ]
+  try:
+    errors = next(ijson.items(bytes(recorder.head), "errors", use_float=True), None)
+  except ijson.JSONError:
+    errors = None
+  return {"errors": errors, "response": kept}
+
 
 class SportsAPIClient:
-  def __init__(self):
-    self.base_url = f"https://{os.getenv('API_URL')}"
+  def __init__(self, base_url: str = None):
+    self.base_url = base_url or f"https://{os.getenv('API_URL')}"
     self.headers = HEADERS
+    self.session = get_shared_session()
+    self.timeout = (CONNECT_TIMEOUT, READ_TIMEOUT)
+    self.rate_limiter = get_api_rate_limiter()
+    self.cache = get_api_response_cache()
+
+  def _get(self, path: str, params: dict, what: str, max_age: int = None, league_ids: set = None) -> APIResult:
+    """GET {base_url}{path} on the shared session and return the `response` list.
+
+    Every attempt first takes a token from the shared rate limiter, so callers
+    don't need to pace themselves. Timeouts, connection errors, 5xx and 429
+    are retried with jittered exponential backoff (honouring Retry-After).
+    Failures are logged and come back as an empty APIResult with ok=False.
+
+    Cacheable endpoints (see utils/api_cache.cache_max_age) are served from
+    Redis while fresh, costing no quota; once stale they are revalidated with
+    the stored ETag / Last-Modified. `max_age` overrides the freshness window
+    (0 = always ask upstream, still revalidating when possible).
+
+    `league_ids` keeps only items from those leagues, dropping the rest while
+    the body streams in (see parse_league_filtered). Cached entries are keyed
+    by the filter too.
+    """
+    policy = cache_max_age(path, params)
+    max_age = policy if max_age is None else max_age
+    cache_params = params
+    if league_ids is not None:
+      digest = hashlib.sha1(",".join(str(i) for i in sorted(league_ids)).encode()).hexdigest()[:12]
+      cache_params = {**params, "leagues": digest}
+    entry = self.cache.get(path, cache_params) if policy else None
+    if entry and self.cache.is_fresh(entry, max_age):
+      return APIResult(entry["response"])
+    headers = {**self.headers, **self.cache.conditional_headers(entry)} if entry else self.headers
+
+    error = None
+    for attempt in range(MAX_RETRIES + 1):
+      if not self.rate_limiter.acquire():
+        print(f"Skipping {what}: daily API limit reached.")
+        return APIResult(error="daily API limit reached")
+
+      retry_after = None
+      stream = league_ids is not None and ijson is not None
+      response = None
+      try:
+        response = self.session.get(
+          f"{self.base_url}{path}", headers=headers, params=params, timeout=self.timeout, stream=stream
+        )
+        record_quota(response.headers)
+        if response.status_code == 304 and entry:
+          self.cache.touch(path, cache_params, entry, policy)
+          return APIResult(entry["response"])
+        if not response.ok:
+          body = None
+        elif stream:
+          response.raw.decode_content = True
+          body = parse_league_filtered(response.raw, league_ids)
+        else:
+          body = response.json()
+          if league_ids is not None:
+            body["response"] = [
+              f for f in body.get("response", []) if f.get("league", {}).get("id") in league_ids
+            ]
+        error, retryable = classify_response(response.status_code, body)
+        retry_after = response.headers.get("Retry-After")
+      except (requests.Timeout, requests.ConnectionError) + _STREAM_ERRORS as e:
+        error, retryable = str(e) or type(e).__name__, True
+      except (requests.RequestException, ValueError) as e:
+        error, retryable = str(e), False
+      finally:
+        # A streamed body that wasn't read to the end (304, error status, parse
+        # failure) would keep its pooled connection checked out until GC.
+        if stream and response is not None:
+          response.close()
 
-  def get_fixtures_by_date(self, date: str):
-    """Fetch fixtures for a specific date from the external API."""
-    url = f"{self.base_url}/fixtures"
+      if error is None:
+        result = APIResult(body.get("response", []))
+        if policy:
+          self.cache.set(path, cache_params, result, response.headers.get("ETag"),
+                         response.headers.get("Last-Modified"), policy)
+        return result
+      if not retryable or attempt == MAX_RETRIES:
+        break
+      delay = backoff_delay(attempt, retry_after)
+      print(f"Retrying {what} in {delay:.1f}s ({error})")
+      time.sleep(delay)
+
+    print(f"Error fetching {what}: {error}")
+    return APIResult(error=error)
+
+  def has_budget(self, reserve: int = 0) -> bool:
+    """True while today's reported quota is above `reserve` (or not yet reported today)."""
+    remaining = get_remaining_today()
+    return remaining is None or remaining > reserve
+
+  def get_fixtures_by_date(self, date: str, league_ids: set = None, max_age: int = None):
+    """Fetch fixtures for a specific date from the external API.
+
+    With `league_ids`, only fixtures from those leagues are kept (streamed filter).
+    `max_age=0` bypasses the cached feed (see _get).
+    """
     params = {"date": date, "timezone": "America/Mexico_City"}
-    try:
-      print(f"Fetching fixtures for date {date} from API...")
-      response = requests.get(url, headers=self.headers, params=params)
-      response.raise_for_status()
-      return response.json().get("response", [])
-    except requests.RequestException as e:
-      print(f"Error fetching fixtures for date {date}: {e}")
-      return []
-
-  def get_team_last_matches(self, team_id: int, last: int = 10):
-    url = f"{self.base_url}/fixtures"
+    print(f"Fetching fixtures for date {date} from API...")
+    return self._get("/fixtures", params, f"fixtures for date {date}", max_age, league_ids=league_ids)
+
+  def get_team_last_matches(self, team_id: int, last: int = 10, max_age: int = None):
     params = {"team": team_id, "last": last}
-    try:
-      response = requests.get(url, headers=self.headers, params=params)
-      response.raise_for_status()
-      return response.json().get("response", [])
-    except requests.RequestException as e:
-      print(f"Error fetching last matches for team {team_id}: {e}")
-      return []
+    return self._get("/fixtures", params, f"last matches for team {team_id}", max_age)
 
   def get_fixture_statistics(self, fixture_id: int):
-    url = f"{self.base_url}/fixtures/statistics"
     params = {"fixture": fixture_id}
-    try:
-      response = requests.get(url, headers=self.headers, params=params)
-      response.raise_for_status()
-      return response.json().get("response", [])
-    except requests.RequestException as e:
-      print(f"Error fetching statistics for fixture {fixture_id}: {e}")
-      return []
+    return self._get("/fixtures/statistics", params, f"statistics for fixture {fixture_id}")
 
   def get_fixture_events(self, fixture_id: int):
     """Fetch the complete event list for a single fixture."""
-    url = f"{self.base_url}/fixtures/events"
     params = {"fixture": fixture_id}
-    try:
-      response = requests.get(url, headers=self.headers, params=params)
-      response.raise_for_status()
-      return response.json().get("response", [])
-    except requests.RequestException as e:
-      print(f"Error fetching events for fixture {fixture_id}: {e}")
-      return []
-
-  def get_live_fixtures(self):
-    """Fetch all currently live fixtures. Response includes events and statistics."""
-    url = f"{self.base_url}/fixtures"
+    return self._get("/fixtures/events", params, f"events for fixture {fixture_id}")
+
+  def get_fixtures_by_ids(self, fixture_ids: list[int]) -> APIResult:
+    """Fetch full fixtures by id, 20 per request.
+
+    Each entry has events, lineups, statistics and players embedded, so one
+    call replaces 4 per-fixture detail calls for up to 20 fixtures. If a batch
+    fails the others are still returned, with ok=False on the combined result.
+    """
+    fixtures, errors = [], []
+    for start in range(0, len(fixture_ids), FIXTURE_IDS_BATCH):
+      batch = fixture_ids[start:start + FIXTURE_IDS_BATCH]
+      params = {"ids": "-".join(str(fid) for fid in batch)}
+      result = self._get("/fixtures", params, f"fixtures {params['ids']}")
+      fixtures.extend(result)
+      if not result.ok:
+        errors.append(result.error)
+    return APIResult(fixtures, "; ".join(errors) if errors else None)
+
+  def get_live_fixtures(self, league_ids: set = None):
+    """Fetch all currently live fixtures. Response includes events and statistics.
+
+    With `league_ids`, only fixtures from those leagues are kept (streamed filter).
+    """
     params = {"live": "all"}
-    try:
-      response = requests.get(url, headers=self.headers, params=params)
-      response.raise_for_status()
-      return response.json().get("response", [])
-    except requests.RequestException as e:
-      print(f"Error fetching live fixtures: {e}")
-      return []
-
-  def get_headtohead_matches(self, team1: int, team2: int, last: int = 10):
-    url = f"{self.base_url}/fixtures/headtohead"
+    return self._get("/fixtures", params, "live fixtures", league_ids=league_ids)
+
+  def get_headtohead_matches(self, team1: int, team2: int, last: int = 10, max_age: int = None):
     params = {"h2h": f"{team1}-{team2}", "last": last}
-    try:
-      response = requests.get(url, headers=self.headers, params=params)
-      response.raise_for_status()
-      return response.json().get("response", [])
-    except requests.RequestException as e:
-      print(f"Error fetching head-to-head matches for teams {team1} and {team2}: {e}")
-      return []
+    return self._get("/fixtures/headtohead", params, f"head-to-head matches for teams {team1} and {team2}", max_age)
 
   def get_fixture_lineups(self, fixture_id: int):
-    url = f"{self.base_url}/fixtures/lineups"
     params = {"fixture": fixture_id}
-    try:
-      response = requests.get(url, headers=self.headers, params=params)
-      response.raise_for_status()
-      return response.json().get("response", [])
-    except requests.RequestException as e:
-      print(f"Error fetching lineups for fixture {fixture_id}: {e}")
-      return []
+    return self._get("/fixtures/lineups", params, f"lineups for fixture {fixture_id}")
 
   def get_fixture_player_statistics(self, fixture_id: int):
-    url = f"{self.base_url}/fixtures/players"
     params = {"fixture": fixture_id}
-    try:
-      response = requests.get(url, headers=self.headers, params=params)
-      response.raise_for_status()
-      return response.json().get("response", [])
-    except requests.RequestException as e:
-      print(f"Error fetching player stats for fixture {fixture_id}: {e}")
-      return []
+    return self._get("/fixtures/players", params, f"player stats for fixture {fixture_id}")
 
   def get_odds_by_fixture(self, fixture_id: int):
     """Fetch betting odds for a specific fixture."""
-    url = f"{self.base_url}/odds"
     params = {"fixture": fixture_id}
-    try:
-      response = requests.get(url, headers=self.headers, params=params)
-      response.raise_for_status()
-      return response.json().get("response", [])
-    except requests.RequestException as e:
-      print(f"Error fetching odds for fixture {fixture_id}: {e}")
-      return []
\ No newline at end of file
+    return self._get("/odds", params, f"odds for fixture {fixture_id}")
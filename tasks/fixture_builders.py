@@ -223,3 +223,15 @@ class FixtureBuilder:
                     penalty_saved=self._safe_int(penalty.get("saved")),
                 ))
         return rows
+
+    def build_all(self, detail):
+        """Every row for one fixture from a /fixtures?ids= entry, which embeds
+        statistics, events, lineups and players alongside the fixture itself."""
+        fixture_id = detail["fixture"]["id"]
+        home_team_id = detail["teams"]["home"]["id"]
+        rows = [self.build_fixture(detail)]
+        rows += self.build_team_stats(fixture_id, home_team_id, detail.get("statistics") or [])
+        rows += self.build_events(fixture_id, detail.get("events") or [])
+        rows += self.build_lineups(fixture_id, detail.get("lineups") or [])
+        rows += self.build_player_stats(fixture_id, detail.get("players") or [])
+        return rows
@@ -0,0 +1,41 @@
+from models.fixture import Fixture
+from services.sports_api_client import FIXTURE_IDS_BATCH
+
+
+def persist_fixtures(db, api_client, builder, matches, reserve: int = 0, label: str = "fixture"):
+    """Persist every match in `matches` that isn't in the DB yet.
+
+    Details come from /fixtures?ids= in batches of 20 (events, lineups,
+    statistics and players embedded), so N fixtures cost ~N/20 requests
+    instead of 4N. Stops before a batch once the day's API quota is down to
+    `reserve`. Returns (saved, skipped, stopped_early).
+    """
+    fixture_ids = list(dict.fromkeys(m["fixture"]["id"] for m in matches))
+    existing = set()
+    if fixture_ids:
+        existing = {fid for (fid,) in db.query(Fixture.id).filter(Fixture.id.in_(fixture_ids)).all()}
+    pending = [fid for fid in fixture_ids if fid not in existing]
+
+    saved = 0
+    skipped = len(existing)
+
+    for start in range(0, len(pending), FIXTURE_IDS_BATCH):
+        if not api_client.has_budget(reserve):
+            print(f" -> API budget down to reserve ({reserve}). Stopping early.")
+            return saved, skipped, True
+
+        details = api_client.get_fixtures_by_ids(pending[start:start + FIXTURE_IDS_BATCH])
+        for detail in details:
+            fixture_id = detail["fixture"]["id"]
+            try:
+                for row in builder.build_all(detail):
+                    db.add(row)
+                db.commit()
+                db.expunge_all()
+                saved += 1
+                print(f"  -> Persisted {label} {fixture_id}")
+            except Exception as e:
+                db.rollback()
+                print(f"  -> ⚠️ Failed to persist {label} {fixture_id}: {e}")
+
+    return saved, skipped, False
@@ -0,0 +1,225 @@
+"""
+Consumes the post-match job queue (utils/job_queue.py) in JOB_WORKER_PROCESSES processes.
+
+Started by the orchestrator; with ORCHESTRATOR_RUNS_JOB_WORKERS=false
+run it on its own instead:  python -m tasks.job_worker
+"""
+import multiprocessing
+import os
+import signal
+import sys
+import time
+from dotenv import load_dotenv
+from utils.redis_client import get_redis_connection
+from utils import serializer
+from utils import schedule_cache
+from utils import live_feed
+from utils import fixture_events
+from utils import job_queue
+from utils.cache_batch import get_many, set_many
+from services.sports_api_client import SportsAPIClient
+
+load_dotenv()
+
+JOB_WORKER_PROCESSES = int(os.getenv("JOB_WORKER_PROCESSES", 4))
+IDLE_SLEEP_SECONDS   = float(os.getenv("JOB_IDLE_SLEEP_SECONDS", 2))
+
+H2H_TTL            = 864000   # 10 days — h2h:teams:{id1}&{id2}
+RECENT_MATCHES_TTL = 86400    # 24 h    — team_recent_matches:{team_id}
+STATS_TTL          = 2592000  # 30 days — fixture_stats:{fixture_id}
+
+# A fixture last seen live at this minute or later can skip the post-match
+# events fetch when its event log matches the final score.
+FINAL_POLL_MIN_ELAPSED = 85
+
+
+def post_match_jobs(date: str, match: dict, last_elapsed) -> list:
+    """(job_id, type, args) for a fixture that just finished: final events, H2H, both teams' recent matches.
+
+    Job ids are stable, so two fixtures sharing a team (or a restart
+    re-detecting the same fixture) queue the work once.
+    """
+    fid = match["fixture"]["id"]
+    home_id = match["teams"]["home"]["id"]
+    away_id = match["teams"]["away"]["id"]
+    team1, team2 = sorted([home_id, away_id])
+    return [
+        (f"final_events:{fid}", "final_events", [date, fid, last_elapsed]),
+        (f"h2h:{team1}&{team2}", "h2h", [team1, team2]),
+        (f"team_recent:{home_id}", "team_recent", [home_id]),
+        (f"team_recent:{away_id}", "team_recent", [away_id]),
+    ]
+
+
+class JobFailed(Exception):
+    """The job should be retried (e.g. the API was unavailable)."""
+
+
+class PostMatchJobs:
+
+    def __init__(self, r):
+        self.r = r
+        self.api_client = SportsAPIClient()
+        self.handlers = {
+            "final_events": self.final_events,
+            "h2h": self.refresh_h2h,
+            "team_recent": self.refresh_team_recent,
+        }
+
+    def run(self, job: job_queue.Job):
+        handler = self.handlers.get(job.type)
+        if handler is None:
+            raise JobFailed(f"unknown job type {job.type!r}")
+        handler(*job.args)
+
+    def _events_complete(self, fid, match, last_elapsed) -> bool:
+        """Whether the event log of a just-finished fixture can be trusted as final.
+
+        Only for a plain FT whose last live poll was late in the match and whose
+        logged goals add up to the final score; anything else (AET, penalties,
+        a VAR-cancelled goal, a worker restart) re-fetches the events.
+        """
+        status = match["fixture"].get("status") or {}
+        goals = match.get("goals") or {}
+        if status.get("short") != "FT" or (last_elapsed or 0) < FINAL_POLL_MIN_ELAPSED:
+            return False
+        if goals.get("home") is None or goals.get("away") is None:
+            return False
+        return fixture_events.goal_count(fixture_events.read_events(self.r, fid)) == goals["home"] + goals["away"]
+
+    def final_events(self, date, fid, last_elapsed=None):
+        match = schedule_cache.read_fixtures(self.r, date, [fid]).get(fid)
+        if match is None:
+            print(f"[JOBS] ⚠️ fixture {fid} is not in the schedule for {date}. Skipping final events.")
+            return
+        if self._events_complete(fid, match, last_elapsed):
+            print(f"[JOBS] ⏭️ fixture {fid} → event log matches the final score, no re-fetch.")
+            return
+
+        # API call first: the merge below may be retried and must not call the API.
+        events = self.api_client.get_fixture_events(fid)
+        if not events.ok:
+            raise JobFailed(f"events for fixture {fid}: {events.error}")
+        # Only what the live polls missed is appended, so readers' `since`
+        # cursors into the log stay valid.
+        appended = fixture_events.append_events(self.r, {fid: events}).get(fid, 0)
+
+        before = {}
+
+        def apply_final_events(current):
+            if fid in current:
+                before.clear()  # the merge may be retried
+                before.update(current[fid])
+                current[fid]["events"] = events
+
+        updated, _ = schedule_cache.merge_fixtures(self.r, date, [fid], apply_final_events)
+        if updated:
+            delta = live_feed.fixture_delta(date, before, updated[fid])
+            live_feed.publish_deltas(self.r, [delta] if delta else [])
+        print(f"[JOBS] ✅ fixture {fid} → {len(events)} final event(s), {appended} new to the log.")
+
+    def refresh_h2h(self, team1, team2):
+        h2h_key = f"h2h:teams:{team1}&{team2}"
+        # max_age=0: the pair just played, so a cached copy from this morning is stale.
+        h2h_data = self.api_client.get_headtohead_matches(team1, team2, max_age=0)
+        if not h2h_data.ok:
+            raise JobFailed(f"head-to-head {team1} vs {team2}: {h2h_data.error}")
+        if h2h_data:
+            self.r.setex(h2h_key, H2H_TTL, serializer.dumps(h2h_data))
+            print(f"[JOBS] ✅ H2H refreshed ({team1} vs {team2}).")
+
+    def refresh_team_recent(self, team_id):
+        team_key = f"team_recent_matches:{team_id}"
+        fixtures = self.api_client.get_team_last_matches(team_id, last=5, max_age=0)
+        if not fixtures.ok:
+            raise JobFailed(f"recent matches for team {team_id}: {fixtures.error}")
+        if not fixtures:
+            # Keep whatever is cached now.
+            print(f"[JOBS] ⚠️ No recent fixtures for team {team_id}. Skipping.")
+            return
+        cached_stats = get_many(self.r, (f"fixture_stats:{f['fixture']['id']}" for f in fixtures))
+        fetched = {}
+        enriched = []
+        for fixture in fixtures:
+            fixture_id = fixture["fixture"]["id"]
+            stats_key = f"fixture_stats:{fixture_id}"
+            stats = cached_stats.get(stats_key)
+            if stats is None:
+                stats = self.api_client.get_fixture_statistics(fixture_id)
+                if stats:
+                    fetched[stats_key] = stats
+            enriched.append({**fixture, "statistics": stats or []})
+        set_many(self.r, fetched, STATS_TTL)
+        self.r.setex(team_key, RECENT_MATCHES_TTL, serializer.dumps(enriched))
+        print(f"[JOBS] ✅ Recent matches refreshed for team {team_id}.")
+
+
+def consume(worker_no: int = 0):
+    """Claim, run and ack jobs until killed.
+
+    A job whose process dies mid-run is not lost: its visibility timeout
+    expires and any consumer's reap() puts it back on the queue.
+    """
+    name = f"{worker_no}:{os.getpid()}"
+    jobs = None
+    print(f"[JOBS] 🚀 Consumer {name} started.")
+    while True:
+        r, error = get_redis_connection()
+        if r is None:
+            print(f"[JOBS] ⚠️ Redis unavailable: {error}. Retrying in {IDLE_SLEEP_SECONDS}s.")
+            time.sleep(IDLE_SLEEP_SECONDS)
+            continue
+        if jobs is None:
+            jobs = PostMatchJobs(r)
+        try:
+            job_queue.reap(r)
+            job = job_queue.claim(r)
+        except Exception as e:
+            print(f"[JOBS ERROR] ❌ {name}: {str(e)}")
+            time.sleep(IDLE_SLEEP_SECONDS)
+            continue
+        if job is None:
+            time.sleep(IDLE_SLEEP_SECONDS)
+            continue
+
+        try:
+            jobs.run(job)
+        except Exception as e:
+            outcome = job_queue.fail(r, job, f"{type(e).__name__}: {e}")
+            print(f"[JOBS ERROR] ❌ {job.id} (attempt {job.attempts}): {str(e)} → {outcome}")
+            continue
+        if not job_queue.ack(r, job):
+            print(f"[JOBS] ⚠️ {job.id} outlived its visibility timeout; it was handed out again.")
+
+
+def main():
+    # Stopping the supervisor (SIGTERM) stops its consumers too: SystemExit
+    # runs multiprocessing's exit hook, which terminates daemonic children.
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    # Started by the orchestrator: exit with it rather than outlive it.
+    parent_pid = int(os.getenv("JOB_WORKER_PARENT_PID", 0))
+
+    # spawn: every consumer builds its own Redis pool and HTTP session.
+    ctx = multiprocessing.get_context("spawn")
+    processes = [
+        ctx.Process(target=consume, args=(n,), name=f"job-worker-{n}", daemon=True)
+        for n in range(JOB_WORKER_PROCESSES)
+    ]
+    for process in processes:
+        process.start()
+    print(f"[JOBS] {JOB_WORKER_PROCESSES} consumer process(es) running.")
+    # Restart any consumer that dies; its claimed job is recovered by the visibility timeout.
+    while True:
+        if parent_pid and os.getppid() != parent_pid:
+            print("[JOBS] Orchestrator is gone. Stopping consumers.")
+            sys.exit(0)
+        for n, process in enumerate(processes):
+            if not process.is_alive():
+                print(f"[JOBS] ⚠️ Consumer {n} exited ({process.exitcode}). Restarting.")
+                processes[n] = ctx.Process(target=consume, args=(n,), name=f"job-worker-{n}", daemon=True)
+                processes[n].start()
+        time.sleep(5)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,22 +1,61 @@
-import json
-import time
+import hashlib
 from datetime import datetime, timedelta, timezone
 from dotenv import load_dotenv
 from dateutil import parser
 from utils.database import SessionLocal
 from utils.redis_client import get_redis_connection
+from utils import serializer
+from utils import schedule_cache
+from utils import live_feed
+from utils import fixture_events
+from utils import job_queue
+from utils import live_stats
 from services.match_service import MatchService
 from services.sports_api_client import SportsAPIClient
+from tasks.job_worker import post_match_jobs
 import models
 import os
 import pytz
 
 load_dotenv()
 
-MATCHES_DATE_TTL  = 432000   # 5 days  — matches:date:{YYYY-MM-DD}
-H2H_TTL           = 864000   # 10 days — h2h:teams:{id1}&{id2}
-RECENT_MATCHES_TTL = 86400   # 24 h    — team_recent_matches:{team_id}
-STATS_TTL          = 2592000 # 30 days — fixture_stats:{fixture_id}
+# Adaptive cadence (see LiveWorker.next_poll_delay). The in-play interval is
+# derived from the daily budget in calculate_live_windows, so the same number
+# of requests as fixed WORKER_INTERVAL_MINUTES polling is spent, mostly while
+# the ball is rolling.
+LIVE_DAILY_BUDGET        = int(os.getenv("LIVE_DAILY_BUDGET", 0))  # 0 = active minutes / WORKER_INTERVAL_MINUTES
+LIVE_MIN_PLAY_SECONDS    = int(os.getenv("LIVE_MIN_PLAY_SECONDS", 30))
+LIVE_BREAK_SECONDS       = int(os.getenv("LIVE_BREAK_SECONDS", 300))  # HT / BT / INT
+LIVE_IDLE_SECONDS        = int(os.getenv("LIVE_IDLE_SECONDS", 900))   # in a window, nothing live yet
+LIVE_DORMANT_MAX_SECONDS = 6 * 3600  # no window left today; the nightly pipeline reschedules anyway
+MIN_POLL_SECONDS         = 5
+
+PLAY_STATUSES  = {'1H', '2H', 'ET', 'P', 'LIVE'}
+BREAK_STATUSES = {'HT', 'BT', 'INT'}
+
+# Expected shape of a fixture from kickoff, in minutes, used for the budget:
+# first half + stoppage, half-time, second half + stoppage.
+FIRST_HALF_MINUTES, HALF_TIME_MINUTES, SECOND_HALF_MINUTES = 50, 15, 55
+
+# Long enough to outlast any gap between polls, so a restart still knows
+# which fixtures were live and queues their post-match jobs.
+TRACKING_IDS_TTL = 6 * 3600
+
+
+def _play_interval(play_minutes: int, budget: float, overhead: float) -> float:
+  """Seconds between in-play polls that spend what breaks and idle polls leave of `budget`.
+
+  Never faster than LIVE_MIN_PLAY_SECONDS; and with nothing left over
+  (budget <= overhead), never slower than a break poll either.
+  """
+  interval = play_minutes * 60 / max(budget - overhead, 1)
+  return min(max(LIVE_MIN_PLAY_SECONDS, interval), LIVE_BREAK_SECONDS)
+
+
+def _live_fingerprint(live_match: dict) -> str:
+  """Digest of exactly the fields merged into the schedule (status/elapsed live in `fixture`)."""
+  merged = [live_match.get(field) for field in ("fixture", "goals", "score", "events", "statistics")]
+  return hashlib.sha1(serializer.dumps(merged, compress=False)).hexdigest()
 
 
 class LiveWorker:
@@ -25,8 +64,17 @@ class LiveWorker:
     self.active_windows = []
     self.active_games_pending = False
     self.live_fixture_ids = set()  # IDs tracked as in-play last cycle
-    self.IN_PLAY_STATUSES = {'1H', 'HT', '2H', 'ET', 'BT', 'P', 'LIVE', 'INT'}
+    self.estimated_requests = 0    # live polls expected today, set by calculate_live_windows
+    self.IN_PLAY_STATUSES = PLAY_STATUSES | BREAK_STATUSES
+    self.live_statuses = set()     # statuses of the favorite fixtures live at the last poll
+    self.kickoffs = []             # today's kickoff times (UTC), sorted
+    self.play_interval = LIVE_MIN_PLAY_SECONDS  # seconds, set by calculate_live_windows
+    self.last_elapsed = {}         # fixture_id -> minute at the last poll
     self.api_client = SportsAPIClient()
+    # Fingerprint of each fixture's last merged live data, valid while the
+    # day's version is still the one this worker wrote (fingerprint_scope).
+    self.fingerprints = {}
+    self.fingerprint_scope = None  # (date, version)
 
   def calculate_live_windows(self):
     """Calculates today's match schedules and creates active time windows."""
@@ -42,6 +90,8 @@ class LiveWorker:
       if not matches:
           print("[WINDOWS] 💤 No matches scheduled for today.")
           self.active_windows = []
+          self.kickoffs = []
+          self.estimated_requests = 0
           return
 
       windows = []
@@ -51,6 +101,7 @@ class LiveWorker:
           if start_local.strftime("%Y-%m-%d") != today_str:
               continue
           windows.append([start_time, start_time + timedelta(hours=3)])
+      self.kickoffs = sorted(start for start, _ in windows)
 
       windows.sort(key=lambda x: x[0])
       merged_windows = []
@@ -75,14 +126,33 @@ class LiveWorker:
         end_local = end_time.astimezone(self.local_tz).strftime("%H:%M")
         print(f"[WINDOWS] 🕒 ActiveWindow: {start_local} - {end_local} (Local Time)")
 
+      # Split the active time into expected play / break / idle minutes and
+      # spend whatever the breaks and idle polls leave of the budget on play.
+      play, breaks = set(), set()
+      for kickoff in self.kickoffs:
+        start = int(kickoff.timestamp() // 60)
+        half_time = start + FIRST_HALF_MINUTES
+        second_half = half_time + HALF_TIME_MINUTES
+        play.update(range(start, half_time))
+        breaks.update(range(half_time, second_half))
+        play.update(range(second_half, second_half + SECOND_HALF_MINUTES))
+      breaks -= play
+      idle_minutes = max(total_active_minutes - len(play) - len(breaks), 0)
+
       minutes_interval = int(os.getenv("WORKER_INTERVAL_MINUTES", 5))
-      estimated_requests = int(total_active_minutes / minutes_interval)
+      budget = LIVE_DAILY_BUDGET or int(total_active_minutes / minutes_interval)
+      overhead = len(breaks) * 60 / LIVE_BREAK_SECONDS + idle_minutes * 60 / LIVE_IDLE_SECONDS
+      self.play_interval = _play_interval(len(play), budget, overhead)
+      estimated_requests = int(len(play) * 60 / self.play_interval + overhead)
+      self.estimated_requests = estimated_requests
 
       print(f"\n[WINDOWS] " + "-"*40)
       print(f"[WINDOWS] 📈 DAILY API CONSUMPTION ESTIMATE 📈")
       print(f"[WINDOWS] " + "-"*40)
-      print(f"[WINDOWS] ⏱️ Refresh Interval : Every {minutes_interval} minutes")
-      print(f"[WINDOWS] ⏳ Total Active Time: {int(total_active_minutes // 60)}h {int(total_active_minutes % 60)}m")
+      print(f"[WINDOWS] ⏱️ Refresh Interval : {self.play_interval:.0f}s in play, {LIVE_BREAK_SECONDS}s at breaks, "
+            f"{LIVE_IDLE_SECONDS}s idle, dormant between windows (budget ~{budget})")
+      print(f"[WINDOWS] ⏳ Total Active Time: {int(total_active_minutes // 60)}h {int(total_active_minutes % 60)}m "
+            f"(~{len(play)}m in play)")
       print(f"[WINDOWS] 📡 Estimated Requests: ~{estimated_requests} API calls")
       print(f"[WINDOWS] " + "-"*40 + "\n")
 
@@ -91,48 +161,30 @@ class LiveWorker:
     finally:
         db.close()
 
-  def _refresh_post_match_caches(self, r, fid, base_matches):
-    """Refreshes H2H and recent-match caches for a just-finished fixture."""
-    if fid not in base_matches:
-      return
-    match_data = base_matches[fid]
-    home_id = match_data["teams"]["home"]["id"]
-    away_id = match_data["teams"]["away"]["id"]
-
-    # H2H
-    ids = sorted([home_id, away_id])
-    h2h_key = f"h2h:teams:{ids[0]}&{ids[1]}"
-    r.delete(h2h_key)
-    time.sleep(0.6)
-    h2h_data = self.api_client.get_headtohead_matches(ids[0], ids[1])
-    if h2h_data:
-      r.setex(h2h_key, H2H_TTL, json.dumps(h2h_data))
-      print(f"[WORKER] ✅ H2H refreshed ({ids[0]} vs {ids[1]}).")
-
-    # Recent matches for home and away team
-    for team_id in (home_id, away_id):
-      team_key = f"team_recent_matches:{team_id}"
-      r.delete(team_key)
-      time.sleep(0.6)
-      fixtures = self.api_client.get_team_last_matches(team_id, last=5)
-      if not fixtures:
-        print(f"[WORKER] ⚠️ No recent fixtures for team {team_id}. Skipping.")
-        continue
-      enriched = []
-      for fixture in fixtures:
-        fixture_id = fixture["fixture"]["id"]
-        stats_key  = f"fixture_stats:{fixture_id}"
-        cached = r.get(stats_key)
-        if cached:
-          stats = json.loads(cached)
-        else:
-          time.sleep(0.6)
-          stats = self.api_client.get_fixture_statistics(fixture_id)
-          if stats:
-            r.setex(stats_key, STATS_TTL, json.dumps(stats))
-        enriched.append({**fixture, "statistics": stats or []})
-      r.setex(team_key, RECENT_MATCHES_TTL, json.dumps(enriched))
-      print(f"[WORKER] ✅ Recent matches refreshed for team {team_id}.")
+  def next_poll_delay(self, now: datetime = None) -> float:
+    """Seconds until the next live poll, from the fixtures' state at the last poll.
+
+    In play (1H/2H/ET/P): play_interval. At a break (HT/BT/INT): LIVE_BREAK_SECONDS.
+    Inside a window with nothing live: LIVE_IDLE_SECONDS, but never past the
+    next kickoff. Between windows: dormant until the next one starts.
+    """
+    now = now or datetime.now(timezone.utc)
+    if self.live_statuses & PLAY_STATUSES:
+      return self.play_interval
+    if self.live_statuses & BREAK_STATUSES:
+      return LIVE_BREAK_SECONDS
+
+    next_kickoff = next((k for k in self.kickoffs if k > now), None)
+    if self.active_games_pending or any(start <= now <= end for start, end in self.active_windows):
+      delay = LIVE_IDLE_SECONDS
+      if next_kickoff:
+        delay = min(delay, (next_kickoff - now).total_seconds())
+      return max(delay, MIN_POLL_SECONDS)
+
+    next_window = next((start for start, _ in self.active_windows if start > now), None)
+    if next_window is None:
+      return LIVE_DORMANT_MAX_SECONDS
+    return max(min((next_window - now).total_seconds(), LIVE_DORMANT_MAX_SECONDS), MIN_POLL_SECONDS)
 
   def run_live_update(self):
     """
@@ -164,7 +216,7 @@ class LiveWorker:
       if not self.live_fixture_ids:
         raw_ids = r.get("live:tracking_ids")
         if raw_ids:
-          self.live_fixture_ids = set(json.loads(raw_ids))
+          self.live_fixture_ids = set(serializer.loads(raw_ids))
           print(f"[WORKER] 🔄 Restored tracking state from Redis: {self.live_fixture_ids}")
 
       # ── 2. Resolve favorite league IDs from DB ─────────────────────────────
@@ -173,92 +225,123 @@ class LiveWorker:
         for league in db.query(models.League).filter(models.League.is_favorite == True).all()
       }
 
-      # ── 3. Fetch all globally live fixtures ────────────────────────────────
-      live_fixtures = self.api_client.get_live_fixtures()
-
-      # ── 4. Filter to favorite leagues only ─────────────────────────────────
-      live_favorites = [
-        f for f in live_fixtures
-        if f.get("league", {}).get("id") in favorite_ids
-      ]
+      # ── 3–4. Fetch live fixtures, keeping favorite leagues only ────────────
+      # The global feed is filtered while it streams in; only favorites are built.
+      live_favorites = self.api_client.get_live_fixtures(league_ids=favorite_ids)
+      if not live_favorites.ok:
+        # Don't treat an outage as "nothing is live": that would mark every
+        # tracked fixture as finished and rewrite the cache without live data.
+        print(f"[WORKER] ⚠️ Live feed unavailable ({live_favorites.error}). Keeping last good data.")
+        return
 
-      print(f"[WORKER] 📡 {len(live_fixtures)} live globally, {len(live_favorites)} in favorite leagues.")
+      print(f"[WORKER] 📡 {len(live_favorites)} live in favorite leagues.")
 
       # ── 5. Update active_games_pending and detect finished fixtures ─────────
       current_ids = {f["fixture"]["id"] for f in live_favorites}
       finished_ids = self.live_fixture_ids - current_ids  # were live, now gone
 
-      self.live_fixture_ids = current_ids
-      r.setex("live:tracking_ids", 600, json.dumps(list(current_ids)))
-
-      self.active_games_pending = any(
-        f.get("fixture", {}).get("status", {}).get("short") in self.IN_PLAY_STATUSES
-        for f in live_favorites
-      )
+      self.live_statuses = {f.get("fixture", {}).get("status", {}).get("short") for f in live_favorites}
+      last_elapsed = self.last_elapsed  # as last seen live, for the fixtures finishing now
+      self.last_elapsed = {f["fixture"]["id"]: f["fixture"].get("status", {}).get("elapsed") for f in live_favorites}
+      self.active_games_pending = bool(self.live_statuses & self.IN_PLAY_STATUSES)
 
-      # Some fixtures dropped out of the live feed — fetch their final events
-      # then force-refresh so FT status is written (events are preserved).
+      # Some fixtures dropped out of the live feed — force-refresh so FT status
+      # is written (events are preserved), then queue the follow-up work
+      # (final events, H2H, recent matches) for the job workers.
       if finished_ids:
-        print(f"[WORKER] 🏁 {len(finished_ids)} fixture(s) just finished. Fetching final events...")
+        print(f"[WORKER] 🏁 {len(finished_ids)} fixture(s) just finished. Capturing FT status...")
         today_str = datetime.now(self.local_tz).strftime("%Y-%m-%d")
-        cache_key  = f"matches:date:{today_str}"
-        raw = r.get(cache_key)
-        if raw:
-          base_matches = {m["fixture"]["id"]: m for m in json.loads(raw)}
-          for fid in finished_ids:
-            time.sleep(0.6)
-            final_events = self.api_client.get_fixture_events(fid)
-            if fid in base_matches:
-              base_matches[fid]["events"] = final_events
-              print(f"[WORKER] ✅ fixture {fid} → {len(final_events)} final event(s) captured.")
-          remaining_ttl = r.ttl(cache_key)
-          ttl = remaining_ttl if remaining_ttl > 0 else MATCHES_DATE_TTL
-          r.setex(cache_key, ttl, json.dumps(list(base_matches.values())))
-
-          print(f"[WORKER] 🔄 Refreshing H2H and recent-match caches...")
-          for fid in finished_ids:
-            self._refresh_post_match_caches(r, fid, base_matches)
+        base_matches = schedule_cache.read_fixtures(r, today_str, finished_ids)
 
         match_service = MatchService(db)
-        match_service.get_matches_by_date(today_str, force_refresh=True)
+        refreshed = {
+          m["fixture"]["id"]: m
+          for m in match_service.get_matches_by_date(today_str, force_refresh=True).get("data", [])
+          if m["fixture"]["id"] in base_matches
+        }
+
+        ft_deltas = []
+        for fid, match in refreshed.items():
+          ft_deltas.append(live_feed.fixture_delta(today_str, base_matches[fid], match))
+        live_feed.publish_deltas(r, [d for d in ft_deltas if d])
         print("[WORKER] ✅ FT status captured.")
 
+        jobs = []
+        for fid, match in refreshed.items():
+          jobs += post_match_jobs(today_str, match, last_elapsed.get(fid))
+        queued = job_queue.enqueue(r, jobs)
+        print(f"[WORKER] 🔄 Queued {queued} post-match job(s) ({len(jobs) - queued} already queued).")
+
+      # Persisted only once the finished fixtures' jobs are queued: after a
+      # crash before this point they are detected (and queued) again.
+      self.live_fixture_ids = current_ids
+      r.setex("live:tracking_ids", TRACKING_IDS_TTL, serializer.dumps(list(current_ids)))
+
       if not live_favorites:
         print("[WORKER] 💤 No live matches in favorite leagues.")
         return
 
       # ── 6. Merge rich data into existing Redis schedule ────────────────────
+      # Only the live fixtures are read and written back (HMGET / HSET), not the
+      # whole day, atomically against a concurrent refresh of the same day.
       today_str = datetime.now(self.local_tz).strftime("%Y-%m-%d")
-      cache_key = f"matches:date:{today_str}"
+      cache_key = schedule_cache.day_key(today_str)
+
+      # Only fixtures whose live data changed since the last merge are written.
+      # Any other writer (refresh, FT capture) bumps the day's version, which
+      # invalidates every fingerprint: the next tick merges everything again.
+      if self.fingerprint_scope != (today_str, schedule_cache.day_version(r, today_str)):
+        self.fingerprints = {}
+      fingerprints = {m["fixture"]["id"]: _live_fingerprint(m) for m in live_favorites}
+      changed_ids = {fid for fid, fp in fingerprints.items() if self.fingerprints.get(fid) != fp}
+      unchanged = len(fingerprints) - len(changed_ids)
+      if not changed_ids:
+        live_stats.record_tick_stats(r, 0, unchanged, wrote=False)
+        print(f"[WORKER] 💤 {unchanged} live fixture(s), none changed since last tick. Nothing written.")
+        return
 
-      raw = r.get(cache_key)
-      if raw is None:
-        print(f"[WORKER] ⚠️ No base schedule in Redis for {today_str}. Cannot merge.")
+      # Only events not seen before are appended to each fixture's log
+      # (readable as a delta: GET /matches/fixture/{id}/events?since=N).
+      appended = fixture_events.append_events(r, {
+        m["fixture"]["id"]: m.get("events") for m in live_favorites if m["fixture"]["id"] in changed_ids
+      })
+
+      deltas = []
+
+      def merge_live(base_matches):
+        deltas.clear()  # the merge may be retried
+        for live_match in live_favorites:
+          fid = live_match["fixture"]["id"]
+          if fid not in base_matches:
+            continue
+
+          base = base_matches[fid]
+          before = dict(base)
+          # Overwrite status/elapsed but keep static base fields (date, venue, referee).
+          base["fixture"] = {**base["fixture"], **live_match["fixture"]}
+          base["goals"]      = live_match.get("goals",      base.get("goals"))
+          base["score"]      = live_match.get("score",      base.get("score"))
+          base["events"]     = live_match.get("events",     [])
+          base["statistics"] = live_match.get("statistics", [])
+          deltas.append(live_feed.fixture_delta(today_str, before, base))
+
+      # The day keeps whatever TTL it has left.
+      updated, version = schedule_cache.merge_fixtures(r, today_str, changed_ids, merge_live)
+      live_stats.record_tick_stats(r, len(changed_ids), unchanged, wrote=bool(updated))
+      if not updated:
+        print(f"[WORKER] ⚠️ No live fixture is in the Redis schedule for {today_str}. Cannot merge.")
         return
+      self.fingerprints.update({fid: fingerprints[fid] for fid in changed_ids})
+      self.fingerprint_scope = (today_str, version)
 
-      base_matches = {m["fixture"]["id"]: m for m in json.loads(raw)}
-
-      updated = 0
-      for live_match in live_favorites:
-        fid = live_match["fixture"]["id"]
-        if fid not in base_matches:
-          continue
-
-        base = base_matches[fid]
-        # Overwrite status/elapsed but keep static base fields (date, venue, referee).
-        base["fixture"] = {**base["fixture"], **live_match["fixture"]}
-        base["goals"]      = live_match.get("goals",      base.get("goals"))
-        base["score"]      = live_match.get("score",      base.get("score"))
-        base["events"]     = live_match.get("events",     [])
-        base["statistics"] = live_match.get("statistics", [])
-        updated += 1
-
-      # Preserve whatever TTL remains; fall back to the standard 5-day TTL.
-      remaining_ttl = r.ttl(cache_key)
-      ttl = remaining_ttl if remaining_ttl > 0 else MATCHES_DATE_TTL
-      r.setex(cache_key, ttl, json.dumps(list(base_matches.values())))
-
-      print(f"[WORKER] ✅ Merged live data for {updated} fixture(s) into {cache_key}.")
+      # Push what changed to connected clients (GET /matches/live/stream)
+      deltas = [d for d in deltas if d]
+      live_feed.publish_deltas(r, deltas)
+
+      print(
+        f"[WORKER] ✅ Merged live data for {len(updated)} changed fixture(s) into {cache_key} "
+        f"({unchanged} unchanged), {sum(appended.values())} new event(s), {len(deltas)} change(s) published."
+      )
       print(f"[WORKER] Active games still pending: {self.active_games_pending}")
 
     except Exception as e:
@@ -1,4 +1,3 @@
-import time
 import os
 from datetime import datetime, timedelta, timezone
 
@@ -8,10 +7,11 @@ from dotenv import load_dotenv
 from services.match_service import MatchService
 from services.notification_service import NotificationService
 from services.sports_api_client import SportsAPIClient
+from services.async_sports_api_client import fan_out
 from tasks.fixture_builders import FixtureBuilder
+from tasks.fixture_persistence import persist_fixtures
 from tasks.filters import is_youth_match
 from utils.database import SessionLocal
-from models.fixture import Fixture
 
 load_dotenv()
 
@@ -27,7 +27,7 @@ class PersistH2HFixturesWorker:
         self.notification_service = NotificationService()
         self.builder = FixtureBuilder()
 
-    def persist_h2h_fixtures(self):
+    def persist_h2h_fixtures(self, reserve: int = 0):
         local_time = datetime.now(self.local_tz).strftime("%H:%M:%S")
         print(f"PERSIST H2H 🚀 {local_time} - Persisting H2H fixtures for upcoming matches")
 
@@ -36,10 +36,7 @@ class PersistH2HFixturesWorker:
             match_service = MatchService(db)
             today = datetime.now(timezone.utc)
 
-            pairs_seen = set()
-            saved = 0
-            skipped = 0
-
+            pairs = {}  # dict: unique pairs in schedule order
             for i in range(days_for_h2h):
                 target_date = (today + timedelta(days=i)).strftime("%Y-%m-%d")
                 matches = match_service.get_matches_by_date(target_date)
@@ -47,19 +44,24 @@ class PersistH2HFixturesWorker:
                 for match in matches.get("data", []):
                     home_id = match["teams"]["home"]["id"]
                     away_id = match["teams"]["away"]["id"]
-                    pair = tuple(sorted([home_id, away_id]))
+                    pairs[tuple(sorted([home_id, away_id]))] = None
 
-                    if pair in pairs_seen:
-                        continue
-                    pairs_seen.add(pair)
+            # Every pair's H2H at once, API_ASYNC_CONCURRENCY in flight.
+            results, stopped_early = fan_out(
+                "get_headtohead_matches", [(team1, team2, 10) for team1, team2 in pairs], reserve
+            )
+            if stopped_early:
+                print(f" -> API budget down to reserve ({reserve}). Stopping early.")
+            finished = [f for h2h_fixtures in results for f in self._finished(h2h_fixtures)]
 
-                    pair_saved, pair_skipped = self._persist_pair(db, pair[0], pair[1])
-                    saved += pair_saved
-                    skipped += pair_skipped
-                    time.sleep(0.5)
+            saved, skipped, out_of_budget = persist_fixtures(
+                db, self.api_client, self.builder, finished, reserve, label="H2H fixture"
+            )
+            stopped_early = stopped_early or out_of_budget
 
+            suffix = ", stopped early: API budget" if stopped_early else ""
             self.notification_service.send_message(
-                f"✅ Task Executed: H2H Fixtures Persisted ({saved} saved, {skipped} already in db)"
+                f"✅ Task Executed: H2H Fixtures Persisted ({saved} saved, {skipped} already in db{suffix})"
             )
             print(f"PERSIST H2H ✅ Done. {saved} saved, {skipped} already in db.")
 
@@ -68,55 +70,10 @@ class PersistH2HFixturesWorker:
         finally:
             db.close()
 
-    def _persist_pair(self, db, team1: int, team2: int) -> tuple[int, int]:
-        saved = 0
-        skipped = 0
-
-        h2h_fixtures = self.api_client.get_headtohead_matches(team1, team2, last=10)
-        finished = [
+    @staticmethod
+    def _finished(h2h_fixtures: list) -> list:
+        return [
             f for f in h2h_fixtures
             if f.get("fixture", {}).get("status", {}).get("short") in FINISHED_STATUSES
             and not is_youth_match(f)
         ]
-
-        for match in finished:
-            fixture_id = match["fixture"]["id"]
-
-            if db.query(Fixture).filter(Fixture.id == fixture_id).first():
-                skipped += 1
-                continue
-
-            home_team_id = match["teams"]["home"]["id"]
-
-            time.sleep(0.6)
-            raw_stats = self.api_client.get_fixture_statistics(fixture_id)
-            time.sleep(0.6)
-            raw_events = self.api_client.get_fixture_events(fixture_id)
-            time.sleep(0.6)
-            raw_lineups = self.api_client.get_fixture_lineups(fixture_id)
-            time.sleep(0.6)
-            raw_player_stats = self.api_client.get_fixture_player_statistics(fixture_id)
-
-            try:
-                db.add(self.builder.build_fixture(match))
-                if raw_stats:
-                    for row in self.builder.build_team_stats(fixture_id, home_team_id, raw_stats):
-                        db.add(row)
-                if raw_events:
-                    for row in self.builder.build_events(fixture_id, raw_events):
-                        db.add(row)
-                if raw_lineups:
-                    for row in self.builder.build_lineups(fixture_id, raw_lineups):
-                        db.add(row)
-                if raw_player_stats:
-                    for row in self.builder.build_player_stats(fixture_id, raw_player_stats):
-                        db.add(row)
-                db.commit()
-                db.expunge_all()
-                saved += 1
-                print(f"  -> Persisted H2H fixture {fixture_id}")
-            except Exception as e:
-                db.rollback()
-                print(f"  -> ⚠️ Failed to persist H2H fixture {fixture_id}: {e}")
-
-        return saved, skipped
@@ -1,4 +1,3 @@
-import time
 import os
 from datetime import datetime, timedelta, timezone
 
@@ -8,10 +7,11 @@ from dotenv import load_dotenv
 from services.match_service import MatchService
 from services.notification_service import NotificationService
 from services.sports_api_client import SportsAPIClient
+from services.async_sports_api_client import fan_out
 from tasks.fixture_builders import FixtureBuilder
+from tasks.fixture_persistence import persist_fixtures
 from tasks.filters import is_youth_match
 from utils.database import SessionLocal
-from models.fixture import Fixture
 
 load_dotenv()
 
@@ -27,7 +27,7 @@ class PersistRecentMatchesWorker:
         self.notification_service = NotificationService()
         self.builder = FixtureBuilder()
 
-    def persist_recent_matches(self):
+    def persist_recent_matches(self, reserve: int = 0):
         local_time = datetime.now(self.local_tz).strftime("%H:%M:%S")
         print(f"PERSIST RECENT 🚀 {local_time} - Persisting last 5 matches per team")
 
@@ -46,61 +46,26 @@ class PersistRecentMatchesWorker:
 
             print(f" -> {len(team_ids)} unique team(s) found")
 
-            saved = 0
-            skipped = 0
-
-            for team_id in team_ids:
-                fixtures = self.api_client.get_team_last_matches(team_id, last=5)
-                finished = [
-                    f for f in fixtures
-                    if f.get("fixture", {}).get("status", {}).get("short") in FINISHED_STATUSES
-                    and not is_youth_match(f)
-                ]
-
-                for match in finished:
-                    fixture_id = match["fixture"]["id"]
-
-                    if db.query(Fixture).filter(Fixture.id == fixture_id).first():
-                        skipped += 1
-                        continue
-
-                    home_team_id = match["teams"]["home"]["id"]
-
-                    time.sleep(0.6)
-                    raw_stats = self.api_client.get_fixture_statistics(fixture_id)
-                    time.sleep(0.6)
-                    raw_events = self.api_client.get_fixture_events(fixture_id)
-                    time.sleep(0.6)
-                    raw_lineups = self.api_client.get_fixture_lineups(fixture_id)
-                    time.sleep(0.6)
-                    raw_player_stats = self.api_client.get_fixture_player_statistics(fixture_id)
-
-                    try:
-                        db.add(self.builder.build_fixture(match))
-                        if raw_stats:
-                            for row in self.builder.build_team_stats(fixture_id, home_team_id, raw_stats):
-                                db.add(row)
-                        if raw_events:
-                            for row in self.builder.build_events(fixture_id, raw_events):
-                                db.add(row)
-                        if raw_lineups:
-                            for row in self.builder.build_lineups(fixture_id, raw_lineups):
-                                db.add(row)
-                        if raw_player_stats:
-                            for row in self.builder.build_player_stats(fixture_id, raw_player_stats):
-                                db.add(row)
-                        db.commit()
-                        db.expunge_all()
-                        saved += 1
-                        print(f"  -> Persisted fixture {fixture_id} (team {team_id})")
-                    except Exception as e:
-                        db.rollback()
-                        print(f"  -> ⚠️ Failed to persist fixture {fixture_id}: {e}")
-
-                time.sleep(0.6)
+            # Every team's last matches at once, API_ASYNC_CONCURRENCY in flight.
+            results, stopped_early = fan_out(
+                "get_team_last_matches", [(team_id, 5) for team_id in team_ids], reserve
+            )
+            if stopped_early:
+                print(f" -> API budget down to reserve ({reserve}). Stopping early.")
+            finished = [
+                f for fixtures in results for f in fixtures
+                if f.get("fixture", {}).get("status", {}).get("short") in FINISHED_STATUSES
+                and not is_youth_match(f)
+            ]
+
+            saved, skipped, out_of_budget = persist_fixtures(
+                db, self.api_client, self.builder, finished, reserve
+            )
+            stopped_early = stopped_early or out_of_budget
 
+            suffix = ", stopped early: API budget" if stopped_early else ""
             self.notification_service.send_message(
-                f"✅ Task Executed: Recent Matches Persisted ({saved} saved, {skipped} already in db)"
+                f"✅ Task Executed: Recent Matches Persisted ({saved} saved, {skipped} already in db{suffix})"
             )
             print(f"PERSIST RECENT ✅ Done. {saved} saved, {skipped} already in db.")
 
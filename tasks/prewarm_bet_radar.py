@@ -1,4 +1,3 @@
-import json
 import re
 import traceback
 from collections import namedtuple
@@ -7,6 +6,10 @@ import pytz
 
 from utils.database import SessionLocal
 from utils.redis_client import get_redis_connection
+from utils import serializer
+from utils.versioned_cache import set_versioned
+from utils import schedule_cache
+from utils.cache_batch import get_many
 from services.bet_radar_service import BetRadarService
 from services.notification_service import NotificationService
 
@@ -68,12 +71,11 @@ class BetRadarPrewarmWorker:
             today = date or datetime.now(self.local_tz).strftime('%Y-%m-%d')
             print(f'BET RADAR PREWARM Running for {today}')
 
-            raw = r.get(f'matches:date:{today}')
-            if not raw:
+            match_data = schedule_cache.read_day(r, today)
+            if not match_data:
                 print('SCOUT PREWARM No schedule in Redis — skipping')
                 return
 
-            match_data = json.loads(raw)
             matches = match_data if isinstance(match_data, list) else match_data.get('fixtures', [])
 
             fixtures = []
@@ -101,28 +103,31 @@ class BetRadarPrewarmWorker:
 
             result = BetRadarService(db).get_suggestions_from_list(fixtures, today)
 
+            # Odds of every fixture referenced below, in one round trip
+            parlay_picks = (result.get('parlay_suggestion') or {}).get('picks', [])
+            fids = [s['fixture_id'] for s in result['suggestions']]
+            fids += [p['fixture_id'] for p in parlay_picks if p.get('fixture_id')]
+            odds_by_key = get_many(r, (f'odds:{fid}' for fid in fids))
+
             # Enrich every top_pick with the best available odd from Redis
             for suggestion in result['suggestions']:
                 fid = suggestion['fixture_id']
-                odds_raw = r.get(f'odds:{fid}')
-                odds_data = json.loads(odds_raw) if odds_raw else []
+                odds_data = odds_by_key.get(f'odds:{fid}', [])
                 for pick in suggestion['top_picks']:
                     pick['best_odd'] = _find_best_odd(
                         odds_data, pick['market'], pick['side'], pick.get('line')
                     )
 
             # Enrich parlay picks (separate objects from top_picks)
-            if result.get('parlay_suggestion'):
-                for pick in result['parlay_suggestion']['picks']:
-                    fid = pick.get('fixture_id')
-                    odds_raw = r.get(f'odds:{fid}') if fid else None
-                    odds_data = json.loads(odds_raw) if odds_raw else []
-                    pick['best_odd'] = _find_best_odd(
-                        odds_data, pick['market'], pick['side'], pick.get('line')
-                    )
+            for pick in parlay_picks:
+                fid = pick.get('fixture_id')
+                odds_data = odds_by_key.get(f'odds:{fid}', [])
+                pick['best_odd'] = _find_best_odd(
+                    odds_data, pick['market'], pick['side'], pick.get('line')
+                )
 
             key = f'bet_radar:{today}'
-            r.setex(key, BET_RADAR_TTL, json.dumps(result, default=str))
+            set_versioned(r, key, serializer.dumps(result, default=str), BET_RADAR_TTL)
             n = len(result['suggestions'])
             print(f'SCOUT PREWARM Done — {n} suggestions saved to {key}')
             self.notification_service.send_message(
@@ -1,5 +1,3 @@
-import json
-import time
 from datetime import datetime, timedelta
 
 import pytz
@@ -9,6 +7,7 @@ from services.match_service import MatchService
 from services.notification_service import NotificationService
 from utils.database import SessionLocal
 from utils.redis_client import get_redis_connection
+from utils import serializer
 
 FINISHED_STATUSES = {"FT", "AET", "PEN"}
 STATS_TTL = 2592000   # 30 days — matches existing fixture_stats TTL
@@ -44,44 +43,35 @@ class PrewarmFinishedFixturesWorker:
             ]
             print(f" -> {len(finished)} finished fixtures found")
 
-            for match in finished:
-                fixture_id = match["fixture"]["id"]
-                home_team_id = match["teams"]["home"]["id"]
-                away_team_id = match["teams"]["away"]["id"]
-
-                # statistics — might already be cached 30 days by routes/teams.py
-                stats_key = f"fixture_stats:{fixture_id}"
-                if not r.exists(stats_key):
-                    data = self.api_client.get_fixture_statistics(fixture_id)
-                    if data is not None:
-                        r.setex(stats_key, STATS_TTL, json.dumps(data))
-                    time.sleep(0.6)
-
-                # events
-                events_key = f"fixture_events:{fixture_id}"
-                if not r.exists(events_key):
-                    data = self.api_client.get_fixture_events(fixture_id)
-                    if data is not None:
-                        r.setex(events_key, EVENTS_TTL, json.dumps(data))
-                    time.sleep(0.6)
-
-                # lineups
-                lineups_key = f"fixture_lineups:{fixture_id}"
-                if not r.exists(lineups_key):
-                    data = self.api_client.get_fixture_lineups(fixture_id)
-                    if data is not None:
-                        r.setex(lineups_key, LINEUPS_TTL, json.dumps(data))
-                    time.sleep(0.6)
-
-                # player stats — 1 call, returns both teams
-                player_stats_key = f"fixture_player_stats:{fixture_id}"
-                if not r.exists(player_stats_key):
-                    data = self.api_client.get_fixture_player_statistics(fixture_id)
-                    if data is not None:
-                        r.setex(player_stats_key, PLAYER_STATS_TTL, json.dumps(data))
-                    time.sleep(0.6)
+            # key prefix, TTL and field embedded in each /fixtures?ids= entry
+            # (fixture_stats might already be cached 30 days by routes/teams.py)
+            detail_keys = [
+                ("fixture_stats", STATS_TTL, "statistics"),
+                ("fixture_events", EVENTS_TTL, "events"),
+                ("fixture_lineups", LINEUPS_TTL, "lineups"),
+                ("fixture_player_stats", PLAYER_STATS_TTL, "players"),
+            ]
+            # Which detail keys are cached already: one pipelined round trip.
+            keys = [f"{prefix}:{match['fixture']['id']}" for match in finished for prefix, _, _ in detail_keys]
+            pipe = r.pipeline(transaction=False)
+            for key in keys:
+                pipe.exists(key)
+            cached = {key for key, hit in zip(keys, pipe.execute()) if hit}
+            missing = [
+                match["fixture"]["id"] for match in finished
+                if not all(f"{prefix}:{match['fixture']['id']}" in cached for prefix, _, _ in detail_keys)
+            ]
 
+            # One request per 20 fixtures instead of 4 per fixture.
+            pipe = r.pipeline(transaction=False)
+            for detail in self.api_client.get_fixtures_by_ids(missing):
+                fixture_id = detail["fixture"]["id"]
+                for prefix, ttl, field in detail_keys:
+                    key = f"{prefix}:{fixture_id}"
+                    if key not in cached:
+                        pipe.setex(key, ttl, serializer.dumps(detail.get(field) or []))
                 print(f"  -> Prewarmed fixture {fixture_id}")
+            pipe.execute()
 
             self.notification_service.send_message(
                 f"✅ Task Executed: Finished Fixtures Prewarmed ({len(finished)} fixtures)"
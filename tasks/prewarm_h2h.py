@@ -1,4 +1,3 @@
-import time
 from datetime import datetime, timedelta, timezone
 from dotenv import load_dotenv
 from utils.database import SessionLocal
@@ -29,7 +28,6 @@ class PrewarmCacheWorker:
                 target_date = (today + timedelta(days=i)).strftime("%Y-%m-%d")
                 matches = match_service.get_matches_by_date(target_date, force_refresh=True)
                 print(f" -> {len(matches.get('data', []))} matches for {target_date}")
-                time.sleep(0.5)
 
             self.notification_service.send_message("✅ Task Executed: Today's Matches Cached")
             print("PREWARM MATCHES ✅ Done.")
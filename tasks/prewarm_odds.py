@@ -3,7 +3,6 @@ from utils.database import SessionLocal
 from services.match_service import MatchService
 from services.odds_service import OddsService
 from services.notification_service import NotificationService
-import time
 import pytz
 
 
@@ -14,8 +13,11 @@ class PrewarmOddsWorker:
         self.odds_service = OddsService()
         self.notification_service = NotificationService()
 
-    def prewarm_odds(self):
-        """Reads today's cached matches and fetches odds for every upcoming fixture."""
+    def prewarm_odds(self, reserve: int = 0):
+        """Reads today's cached matches and fetches odds for every upcoming fixture.
+
+        Stops early once the day's API quota drops to `reserve` requests.
+        """
         db = SessionLocal()
         try:
             match_service = MatchService(db)
@@ -33,10 +35,12 @@ class PrewarmOddsWorker:
             print(f" -> {len(upcoming)} upcoming matches found")
 
             for match in upcoming:
+                if not self.odds_service.api_client.has_budget(reserve):
+                    print(f" -> API budget down to reserve ({reserve}). Stopping early.")
+                    break
                 fixture_id = match["fixture"]["id"]
                 self.odds_service.get_odds_by_fixture(fixture_id)
                 print(f"  -> Cached odds for fixture {fixture_id}")
-                time.sleep(0.6)
 
             self.notification_service.send_message("✅ Task Executed: Odds Data Cached")
             print("PREWARM ODDS ✅ Done.")
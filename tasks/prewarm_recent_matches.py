@@ -1,9 +1,9 @@
-import json
-import time
 from datetime import datetime
 from dotenv import load_dotenv
 from utils.database import SessionLocal
 from utils.redis_client import get_redis_connection
+from utils import serializer
+from utils.cache_batch import get_many, set_many
 from services.match_service import MatchService
 from services.sports_api_client import SportsAPIClient
 from services.notification_service import NotificationService
@@ -62,39 +62,38 @@ class PrewarmRecentMatchesWorker:
                 if not fixtures:
                     print(f" -> No recent fixtures returned for team {team_id}. Skipping.")
                     teams_failed += 1
-                    time.sleep(0.6)  # still rate-limit before the next team call
                     continue
 
                 # ── Inner loop: deep stats per fixture ─────────────────────────
+                # Cached stats for all of the team's fixtures in one round trip
+                cached_stats = get_many(self.r, (f"fixture_stats:{f['fixture']['id']}" for f in fixtures))
+                fetched = {}
                 enriched = []
                 for fixture in fixtures:
                     fixture_id = fixture["fixture"]["id"]
                     stats_key  = f"fixture_stats:{fixture_id}"
 
-                    cached = self.r.get(stats_key)
-                    if cached:
+                    if stats_key in cached_stats:
                         # Historical match — stats never change; skip the API call
-                        stats = json.loads(cached)
+                        stats = cached_stats[stats_key]
                         stats_cached += 1
                         print(f"    [cache hit]  fixture_stats:{fixture_id}")
                     else:
-                        time.sleep(0.6)  # rate-limit before each uncached stats call
                         stats = self.api_client.get_fixture_statistics(fixture_id)
                         if stats:
-                            self.r.setex(stats_key, STATS_TTL, json.dumps(stats))
+                            fetched[stats_key] = stats
                         stats_fetched += 1
                         print(f"    [fetched]    fixture_stats:{fixture_id} ({len(stats)} team stat block(s))")
 
                     enriched.append({**fixture, "statistics": stats})
+                set_many(self.r, fetched, STATS_TTL)
 
                 # ── Save merged payload ────────────────────────────────────────
                 team_key = f"team_recent_matches:{team_id}"
-                self.r.setex(team_key, RECENT_MATCHES_TTL, json.dumps(enriched))
+                self.r.setex(team_key, RECENT_MATCHES_TTL, serializer.dumps(enriched))
                 print(f" -> Stored last 5 matches for team {team_id} ({len(enriched)} fixture(s)) [{team_key}]")
                 teams_stored += 1
 
-                time.sleep(0.6)  # rate-limit before the next team call
-
             print(
                 f"[RECENT MATCHES] ✅ Done. "
                 f"Teams stored: {teams_stored}, skipped: {teams_failed} | "
@@ -0,0 +1,12 @@
+import os
+import sys
+import tempfile
+
+# Importable without a .env: a throwaway SQLite DB, and a Redis port nothing
+# listens on, so services run their cache-miss paths.
+os.environ.setdefault("DATABASE_URL", "sqlite:///" + os.path.join(tempfile.gettempdir(), "sports-schedule-test.db"))
+os.environ.setdefault("REDIS_HOST", "127.0.0.1")
+os.environ.setdefault("REDIS_PORT", "1")
+os.environ.pop("REDIS_URL", None)
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,46 @@
+import json
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from routes import matches, odds
+from services.match_service import MatchService
+from services.sports_api_client import APIResult
+from utils import serializer
+
+# Well over COMPRESS_MIN_BYTES: dumps() would store this compressed in Redis.
+BIG = [{"fixture": {"id": i, "venue": {"name": "Estadio Azteca" * 4}}} for i in range(40)]
+
+
+def _client():
+    app = FastAPI()
+    app.include_router(matches.router)
+    app.include_router(odds.router)
+    return TestClient(app)
+
+
+def test_json_response_never_sends_the_storage_envelope():
+    response = serializer.json_response({"data": BIG})
+    assert len(response.body) >= serializer.COMPRESS_MIN_BYTES
+    assert not serializer.is_packed(response.body)
+    assert json.loads(response.body) == {"data": BIG}
+
+
+def test_matches_by_date_miss_is_plain_json(monkeypatch):
+    monkeypatch.setattr(MatchService, "_refresh_from_api", lambda self, date, max_age=None: {"data": BIG})
+    response = _client().get("/matches/by-date", params={"date": "2026-10-18"})
+    assert response.status_code == 200
+    assert len(response.content) >= serializer.COMPRESS_MIN_BYTES
+    assert response.json() == {"data": BIG}
+    assert response.headers["etag"] == serializer.content_etag(response.content)
+
+
+def test_odds_miss_is_plain_json(monkeypatch):
+    bookmakers = [{"name": "bet365", "bets": [{"name": "Match Winner", "values": BIG}]}]
+    monkeypatch.setattr(odds.odds_service, "r", None)
+    monkeypatch.setattr(odds.odds_service.api_client, "get_odds_by_fixture",
+                        lambda fixture_id: APIResult([{"bookmakers": bookmakers}]))
+    response = _client().get("/odds/fixture/1")
+    assert response.status_code == 200
+    assert len(response.content) >= serializer.COMPRESS_MIN_BYTES
+    assert response.json() == {"data": [{"bookmakers": bookmakers}]}
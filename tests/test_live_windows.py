@@ -0,0 +1,20 @@
+from tasks import live_matches
+from tasks.live_matches import LIVE_BREAK_SECONDS, LIVE_MIN_PLAY_SECONDS, _play_interval
+
+
+def test_play_interval_spends_the_leftover_budget():
+    # 105 play minutes, 60 requests left after breaks and idle polls.
+    assert _play_interval(105, budget=80, overhead=20) == 105 * 60 / 60
+
+
+def test_play_interval_is_never_below_the_minimum():
+    assert _play_interval(105, budget=100000, overhead=20) == LIVE_MIN_PLAY_SECONDS
+
+
+def test_play_interval_with_the_budget_exhausted(monkeypatch):
+    # Breaks and idle polls alone use up the budget: rather than one poll
+    # for all of the play minutes, play is polled at the break cadence.
+    assert _play_interval(105, budget=10, overhead=10) == LIVE_BREAK_SECONDS
+    assert _play_interval(420, budget=5, overhead=30) == LIVE_BREAK_SECONDS
+    monkeypatch.setattr(live_matches, "LIVE_BREAK_SECONDS", 120)
+    assert _play_interval(105, budget=0, overhead=30) == 120
@@ -0,0 +1,124 @@
+"""
+Redis-backed cache of raw API-Sports responses, used by SportsAPIClient
+"""
+import os
+import time
+from datetime import datetime
+from urllib.parse import urlencode
+
+import pytz
+import redis
+from dotenv import load_dotenv
+
+from utils.redis_client import get_redis_connection
+from utils import serializer
+
+load_dotenv()
+
+# How long an entry is kept for ETag / Last-Modified revalidation after it
+# stops being fresh. Never shorter than the freshness window itself.
+RETENTION = int(os.getenv("API_CACHE_RETENTION", 86400))  # 24 h
+
+# Seconds a cached response is served without asking the API at all.
+# 0 = always go upstream (live data) and don't keep a copy.
+ENDPOINT_MAX_AGE = {
+    "/fixtures/headtohead": 21600,  # 6 h — only changes when the pair plays
+    "/fixtures/statistics": 600,
+    "/fixtures/lineups": 600,
+    "/fixtures/players": 600,
+    "/fixtures/events": 0,          # final events are fetched right at full time
+    "/odds": 1800,
+}
+FIXTURES_TODAY_MAX_AGE = 60        # statuses move all day
+FIXTURES_FUTURE_MAX_AGE = 1800
+FIXTURES_PAST_MAX_AGE = 21600
+FIXTURES_TEAM_MAX_AGE = 3600
+
+_LOCAL_TZ = pytz.timezone("America/Mexico_City")
+
+
+def cache_max_age(path: str, params: dict) -> int:
+    """Freshness policy for one upstream call."""
+    if path != "/fixtures":
+        return ENDPOINT_MAX_AGE.get(path, 0)
+    if "live" in params or "ids" in params:
+        return 0
+    if "team" in params:
+        return FIXTURES_TEAM_MAX_AGE
+    if "date" in params:
+        today = datetime.now(_LOCAL_TZ).strftime("%Y-%m-%d")
+        if params["date"] == today:
+            return FIXTURES_TODAY_MAX_AGE
+        return FIXTURES_FUTURE_MAX_AGE if params["date"] > today else FIXTURES_PAST_MAX_AGE
+    return 0
+
+
+class APIResponseCache:
+    """Stores {"fetched_at", "etag", "last_modified", "response"} per endpoint + params.
+
+    Keys look like `api_cache:/fixtures/headtohead?h2h=1-2&last=10`. Any Redis
+    error degrades to a cache miss; the cache never makes a call fail.
+    """
+
+    def __init__(self):
+        self._r = None
+
+    def _redis(self):
+        if self._r is None:
+            self._r, _ = get_redis_connection()
+        return self._r
+
+    @staticmethod
+    def key(path: str, params: dict) -> str:
+        return f"api_cache:{path}?{urlencode(sorted(params.items()))}"
+
+    def get(self, path: str, params: dict) -> dict | None:
+        r = self._redis()
+        if r is None:
+            return None
+        try:
+            raw = r.get(self.key(path, params))
+        except redis.RedisError:
+            return None
+        return serializer.loads(raw) if raw else None
+
+    def set(self, path: str, params: dict, response: list, etag: str = None,
+            last_modified: str = None, max_age: int = 0) -> None:
+        r = self._redis()
+        if r is None:
+            return
+        entry = {
+            "fetched_at": time.time(),
+            "etag": etag,
+            "last_modified": last_modified,
+            "response": response,
+        }
+        try:
+            r.setex(self.key(path, params), max(max_age, RETENTION), serializer.dumps(entry))
+        except redis.RedisError as e:
+            print(f"[API CACHE] ⚠️ Could not store {path}: {e}")
+
+    def touch(self, path: str, params: dict, entry: dict, max_age: int = 0) -> None:
+        """Mark a revalidated (304) entry as fresh again."""
+        self.set(path, params, entry["response"], entry.get("etag"), entry.get("last_modified"), max_age)
+
+    @staticmethod
+    def is_fresh(entry: dict, max_age: int) -> bool:
+        return max_age > 0 and time.time() - entry.get("fetched_at", 0) < max_age
+
+    @staticmethod
+    def conditional_headers(entry: dict) -> dict:
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+
+_cache = APIResponseCache()
+
+
+def get_api_response_cache() -> APIResponseCache:
+    """Process-wide cache shared by every SportsAPIClient."""
+    return _cache
@@ -0,0 +1,81 @@
+"""
+Tracks the API-Sports quota reported in response headers
+"""
+import time
+
+import redis
+
+from utils.redis_client import get_redis_connection
+
+QUOTA_KEY = "api:quota"
+QUOTA_TTL = 86400  # 24 h — the daily counter resets at 00:00 UTC anyway
+
+# Response header -> field stored in the api:quota hash
+_QUOTA_HEADERS = {
+    "x-ratelimit-requests-limit": "day_limit",
+    "x-ratelimit-requests-remaining": "day_remaining",
+    "x-ratelimit-limit": "minute_limit",
+    "x-ratelimit-remaining": "minute_remaining",
+}
+
+_r = None
+
+
+def _redis():
+    global _r
+    if _r is None:
+        _r, _ = get_redis_connection()
+    return _r
+
+
+def record_quota(headers) -> None:
+    """Store the rate-limit headers of an API-Sports response in Redis."""
+    fields = {
+        field: headers[header]
+        for header, field in _QUOTA_HEADERS.items()
+        if headers.get(header) is not None
+    }
+    if not fields:
+        return
+    r = _redis()
+    if r is None:
+        return
+    fields["updated_at"] = int(time.time())
+    try:
+        pipe = r.pipeline()
+        pipe.hset(QUOTA_KEY, mapping=fields)
+        pipe.expire(QUOTA_KEY, QUOTA_TTL)
+        pipe.execute()
+    except redis.RedisError as e:
+        print(f"[QUOTA] ⚠️ Could not record quota headers: {e}")
+
+
+def get_quota() -> dict:
+    """Last quota seen in any response, as ints. Empty dict if nothing recorded."""
+    r = _redis()
+    if r is None:
+        return {}
+    try:
+        raw = r.hgetall(QUOTA_KEY)
+    except redis.RedisError:
+        return {}
+    quota = {}
+    for field, value in raw.items():
+        if isinstance(field, bytes):
+            field = field.decode()
+        try:
+            quota[field] = int(value)
+        except (TypeError, ValueError):
+            continue
+    return quota
+
+
+def get_remaining_today() -> int | None:
+    """Requests left in today's quota, or None when no response has reported it yet today.
+
+    A value recorded before 00:00 UTC belongs to yesterday's counter, which has reset since.
+    """
+    quota = get_quota()
+    if quota.get("updated_at", 0) < time.time() // 86400 * 86400:
+        return None
+    return quota.get("day_remaining")
@@ -0,0 +1,29 @@
+"""
+Batched reads/writes of serializer-encoded Redis keys: N keys, one round trip
+"""
+from utils import serializer
+
+# Keys per MGET; the chunks still share one pipeline (one round trip).
+MGET_CHUNK = 500
+
+
+def get_many(r, keys) -> dict:
+    """{key: decoded value} for the keys that are cached (misses are left out)."""
+    keys = list(dict.fromkeys(keys))
+    if not keys:
+        return {}
+    pipe = r.pipeline(transaction=False)
+    for i in range(0, len(keys), MGET_CHUNK):
+        pipe.mget(keys[i:i + MGET_CHUNK])
+    values = [value for chunk in pipe.execute() for value in chunk]
+    return {key: serializer.loads(value) for key, value in zip(keys, values) if value is not None}
+
+
+def set_many(r, items: dict, ttl: int) -> None:
+    """SETEX every {key: value} (encoded with serializer.dumps) in one pipeline."""
+    if not items:
+        return
+    pipe = r.pipeline(transaction=False)
+    for key, value in items.items():
+        pipe.setex(key, ttl, serializer.dumps(value))
+    pipe.execute()
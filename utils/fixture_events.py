@@ -0,0 +1,86 @@
+"""
+Append-only per-fixture event log, deduplicated by a stable event identity
+"""
+from collections import Counter
+
+from utils import serializer
+
+EVENTS_TTL = 432000  # 5 days, like the daily schedule
+
+# fixture:events:{id}       list  events in the order they were first seen
+# fixture:events:{id}:ids   set   identities already in the list
+
+# Appends only the events whose identity is new; the log is never rewritten,
+# so an index into it is a valid cursor for readers (read_events(since=...)).
+_APPEND_SCRIPT = """
+local n = 0
+for i = 2, #ARGV, 2 do
+  if redis.call('SADD', KEYS[2], ARGV[i]) == 1 then
+    redis.call('RPUSH', KEYS[1], ARGV[i + 1])
+    n = n + 1
+  end
+end
+if n > 0 then
+  redis.call('EXPIRE', KEYS[1], ARGV[1])
+  redis.call('EXPIRE', KEYS[2], ARGV[1])
+end
+return n
+"""
+
+# Goals as counted in the final score (a missed penalty is a "Goal" event too).
+_SCORING_DETAILS = {"Normal Goal", "Own Goal", "Penalty"}
+
+
+def _keys(fixture_id) -> list[str]:
+    return [f"fixture:events:{fixture_id}", f"fixture:events:{fixture_id}:ids"]
+
+
+def event_identity(event: dict) -> str:
+    """minute|extra|team|player|type|detail: the same event keeps it across polls."""
+    time = event.get("time") or {}
+    return "|".join(str(part) for part in (
+        time.get("elapsed"),
+        time.get("extra"),
+        (event.get("team") or {}).get("id"),
+        (event.get("player") or {}).get("id"),
+        event.get("type"),
+        event.get("detail"),
+    ))
+
+
+def _identities(events: list) -> list[str]:
+    """Identity plus occurrence number, so two identical-looking events both count."""
+    seen = Counter()
+    out = []
+    for event in events:
+        identity = event_identity(event)
+        seen[identity] += 1
+        out.append(f"{identity}#{seen[identity]}")
+    return out
+
+
+def append_events(r, events_by_fixture: dict) -> dict:
+    """Append the new events of each {fixture_id: events} in one pipeline.
+
+    Returns {fixture_id: number of events appended}.
+    """
+    events_by_fixture = {fid: events for fid, events in events_by_fixture.items() if events}
+    if not events_by_fixture:
+        return {}
+    script = r.register_script(_APPEND_SCRIPT)
+    pipe = r.pipeline(transaction=False)
+    for fid, events in events_by_fixture.items():
+        args = [EVENTS_TTL]
+        for identity, event in zip(_identities(events), events):
+            args += [identity, serializer.dumps(event, compress=False)]
+        script(keys=_keys(fid), args=args, client=pipe)
+    return dict(zip(events_by_fixture, pipe.execute()))
+
+
+def read_events(r, fixture_id, since: int = 0) -> list:
+    """Events of the log from index `since` on (0 = all)."""
+    return [serializer.loads(raw) for raw in r.lrange(_keys(fixture_id)[0], since, -1)]
+
+
+def goal_count(events: list) -> int:
+    return sum(1 for e in events if e.get("type") == "Goal" and e.get("detail") in _SCORING_DETAILS)
@@ -0,0 +1,170 @@
+"""
+Durable Redis work queue: idempotent job ids, visibility timeout, retries, dead letters
+"""
+import os
+import time
+
+from dotenv import load_dotenv
+
+from utils import serializer
+
+load_dotenv()
+
+VISIBILITY_TIMEOUT = int(os.getenv("JOB_VISIBILITY_TIMEOUT", 300))  # seconds a claimed job stays invisible
+MAX_ATTEMPTS       = int(os.getenv("JOB_MAX_ATTEMPTS", 5))
+RETRY_BASE_DELAY   = int(os.getenv("JOB_RETRY_BASE_DELAY", 30))     # seconds, doubled per attempt
+REAP_BATCH         = 100
+
+# jobs:pending     list  job ids waiting to be claimed (LPUSH in, RPOP out)
+# jobs:processing  zset  job id -> ms timestamp: visibility deadline of a claimed
+#                        job, or when a failed job may be retried
+# jobs:data        hash  job id -> {"type", "args"}; present while the job is
+#                        queued or running, which is what makes enqueue idempotent
+# jobs:attempts    hash  job id -> claims so far
+# jobs:errors      hash  job id -> last error
+# jobs:dead        hash  job id -> job data, after MAX_ATTEMPTS
+PENDING, PROCESSING, DATA, ATTEMPTS, ERRORS, DEAD = (
+    "jobs:pending", "jobs:processing", "jobs:data", "jobs:attempts", "jobs:errors", "jobs:dead",
+)
+
+_ENQUEUE_SCRIPT = """
+local n = 0
+for i = 1, #ARGV, 2 do
+  if redis.call('HSETNX', KEYS[1], ARGV[i], ARGV[i + 1]) == 1 then
+    redis.call('LPUSH', KEYS[2], ARGV[i])
+    n = n + 1
+  end
+end
+return n
+"""
+
+_CLAIM_SCRIPT = """
+local id = redis.call('RPOP', KEYS[1])
+if not id then return false end
+redis.call('ZADD', KEYS[2], ARGV[1], id)
+local attempts = redis.call('HINCRBY', KEYS[4], id, 1)
+return {id, redis.call('HGET', KEYS[3], id) or '', attempts}
+"""
+
+# The claim's deadline doubles as a lease: a worker whose job timed out and
+# was handed to someone else can no longer ack or fail it.
+_ACK_SCRIPT = """
+if tonumber(redis.call('ZSCORE', KEYS[1], ARGV[1]) or -1) ~= tonumber(ARGV[2]) then return 0 end
+redis.call('ZREM', KEYS[1], ARGV[1])
+redis.call('HDEL', KEYS[2], ARGV[1])
+redis.call('HDEL', KEYS[3], ARGV[1])
+redis.call('HDEL', KEYS[4], ARGV[1])
+return 1
+"""
+
+_FAIL_SCRIPT = """
+if tonumber(redis.call('ZSCORE', KEYS[1], ARGV[1]) or -1) ~= tonumber(ARGV[2]) then return -1 end
+redis.call('HSET', KEYS[4], ARGV[1], ARGV[3])
+if tonumber(redis.call('HGET', KEYS[3], ARGV[1]) or 0) >= tonumber(ARGV[5]) then
+  redis.call('ZREM', KEYS[1], ARGV[1])
+  redis.call('HSET', KEYS[5], ARGV[1], redis.call('HGET', KEYS[2], ARGV[1]) or '')
+  redis.call('HDEL', KEYS[2], ARGV[1])
+  redis.call('HDEL', KEYS[3], ARGV[1])
+  return 0
+end
+redis.call('ZADD', KEYS[1], ARGV[4], ARGV[1])
+return 1
+"""
+
+# Jobs past their deadline: crashed/stuck workers and failed jobs due for a
+# retry go back to the front of the queue, or to the dead letters.
+_REAP_SCRIPT = """
+local ids = redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', ARGV[1], 'LIMIT', 0, tonumber(ARGV[3]))
+for _, id in ipairs(ids) do
+  redis.call('ZREM', KEYS[1], id)
+  if tonumber(redis.call('HGET', KEYS[4], id) or 0) >= tonumber(ARGV[2]) then
+    if redis.call('HEXISTS', KEYS[5], id) == 0 then
+      redis.call('HSET', KEYS[5], id, 'visibility timeout')
+    end
+    redis.call('HSET', KEYS[6], id, redis.call('HGET', KEYS[3], id) or '')
+    redis.call('HDEL', KEYS[3], id)
+    redis.call('HDEL', KEYS[4], id)
+  else
+    redis.call('RPUSH', KEYS[2], id)
+  end
+end
+return #ids
+"""
+
+
+class Job:
+    """A claimed job. `lease` must be passed back to ack/fail."""
+
+    __slots__ = ("id", "type", "args", "attempts", "lease")
+
+    def __init__(self, job_id: str, job_type: str, args: list, attempts: int, lease: int):
+        self.id = job_id
+        self.type = job_type
+        self.args = args
+        self.attempts = attempts
+        self.lease = lease
+
+
+def _now_ms() -> int:
+    return int(time.time() * 1000)
+
+
+def enqueue(r, jobs) -> int:
+    """Queue (job_id, job_type, args) tuples in one round trip.
+
+    A job id already queued or running is skipped, so callers can enqueue
+    the same work again (e.g. after a restart) without doubling it.
+    Returns how many jobs were added.
+    """
+    args = []
+    for job_id, job_type, job_args in jobs:
+        args += [job_id, serializer.dumps({"type": job_type, "args": list(job_args)}, compress=False)]
+    if not args:
+        return 0
+    return r.register_script(_ENQUEUE_SCRIPT)(keys=[DATA, PENDING], args=args)
+
+
+def claim(r, visibility_timeout: int = VISIBILITY_TIMEOUT) -> Job | None:
+    """Take the next job; it is invisible to others until acked, failed or timed out."""
+    deadline = _now_ms() + visibility_timeout * 1000
+    out = r.register_script(_CLAIM_SCRIPT)(keys=[PENDING, PROCESSING, DATA, ATTEMPTS], args=[deadline])
+    if not out:
+        return None
+    job_id, raw, attempts = out
+    data = serializer.loads(raw) if raw else {"type": None, "args": []}
+    return Job(job_id.decode(), data["type"], data["args"], int(attempts), deadline)
+
+
+def ack(r, job: Job) -> bool:
+    """Mark the job done. False if its lease expired and it was handed out again."""
+    return bool(r.register_script(_ACK_SCRIPT)(keys=[PROCESSING, DATA, ATTEMPTS, ERRORS], args=[job.id, job.lease]))
+
+
+def fail(r, job: Job, error: str) -> str:
+    """Schedule a retry with exponential backoff, or dead-letter after MAX_ATTEMPTS.
+
+    Returns "retry", "dead" or "lost" (lease expired; someone else owns the job).
+    """
+    retry_at = _now_ms() + RETRY_BASE_DELAY * 1000 * 2 ** (job.attempts - 1)
+    out = r.register_script(_FAIL_SCRIPT)(
+        keys=[PROCESSING, DATA, ATTEMPTS, ERRORS, DEAD],
+        args=[job.id, job.lease, error[:1000], retry_at, MAX_ATTEMPTS],
+    )
+    return {1: "retry", 0: "dead"}.get(out, "lost")
+
+
+def reap(r) -> int:
+    """Requeue timed-out jobs and failed jobs due for a retry. Returns how many were moved."""
+    return r.register_script(_REAP_SCRIPT)(
+        keys=[PROCESSING, PENDING, DATA, ATTEMPTS, ERRORS, DEAD],
+        args=[_now_ms(), MAX_ATTEMPTS, REAP_BATCH],
+    )
+
+
+def stats(r) -> dict:
+    pipe = r.pipeline(transaction=False)
+    pipe.llen(PENDING)
+    pipe.zcard(PROCESSING)
+    pipe.hlen(DEAD)
+    pending, processing, dead = pipe.execute()
+    return {"pending": pending, "processing": processing, "dead": dead}
@@ -0,0 +1,133 @@
+"""
+Redis pub/sub change feed of live fixture updates (published by LiveWorker, streamed over SSE)
+"""
+import asyncio
+import os
+import threading
+import time
+
+from dotenv import load_dotenv
+
+from utils import serializer
+from utils.fixture_events import event_identity
+from utils.redis_client import get_redis_connection
+
+load_dotenv()
+
+LIVE_FEED_CHANNEL = "live:fixtures"
+FEED_QUEUE_SIZE   = int(os.getenv("LIVE_FEED_QUEUE_SIZE", 256))  # per client
+_RESUBSCRIBE_DELAY = 5  # seconds
+
+# Sent instead of a delta when a client may have missed some: it should re-pull the day.
+RESYNC = b"resync"
+
+
+def fixture_delta(date: str, before: dict, after: dict) -> dict | None:
+    """What changed between two versions of a fixture, or None.
+
+    Carries status (incl. elapsed), goals and score when they differ, and the
+    events not seen before. If earlier events were removed or corrected
+    (e.g. a VAR decision) the full list is sent as `events` instead.
+    """
+    delta = {}
+    status = (after.get("fixture") or {}).get("status")
+    if status != (before.get("fixture") or {}).get("status"):
+        delta["status"] = status
+    for field in ("goals", "score"):
+        if after.get(field) != before.get(field):
+            delta[field] = after.get(field)
+
+    old_events, new_events = before.get("events") or [], after.get("events") or []
+    old_keys = {event_identity(e) for e in old_events}
+    new_keys = {event_identity(e) for e in new_events}
+    if len(new_events) < len(old_events) or not old_keys <= new_keys:
+        delta["events"] = new_events
+    elif len(new_events) > len(old_events):
+        added = [e for e in new_events if event_identity(e) not in old_keys]
+        delta["new_events"] = added or new_events[len(old_events):]
+
+    if not delta:
+        return None
+    return {"fixture_id": after["fixture"]["id"], "date": date, **delta}
+
+
+def publish_deltas(r, deltas) -> None:
+    """PUBLISH each delta on LIVE_FEED_CHANNEL in one pipeline."""
+    if not deltas:
+        return
+    pipe = r.pipeline(transaction=False)
+    for delta in deltas:
+        pipe.publish(LIVE_FEED_CHANNEL, serializer.dumps(delta, compress=False))
+    pipe.execute()
+
+
+class _Broadcaster:
+    """One Redis subscription per process fanned out to every SSE client's queue.
+
+    The subscriber thread hands raw messages to each client's event loop; a
+    client whose queue is full (too slow), or any client after the
+    subscription dropped, gets RESYNC instead of a gap in the feed.
+    """
+
+    def __init__(self):
+        self._clients = set()  # (loop, queue)
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def subscribe(self) -> asyncio.Queue:
+        queue = asyncio.Queue(maxsize=FEED_QUEUE_SIZE)
+        with self._lock:
+            self._clients.add((asyncio.get_running_loop(), queue))
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._listen, name="live-feed", daemon=True)
+                self._thread.start()
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue) -> None:
+        with self._lock:
+            self._clients = {(loop, q) for loop, q in self._clients if q is not queue}
+
+    def _deliver(self, message: bytes) -> None:
+        with self._lock:
+            clients = list(self._clients)
+        for loop, queue in clients:
+            try:
+                loop.call_soon_threadsafe(self._offer, queue, message)
+            except RuntimeError:  # loop closed
+                self.unsubscribe(queue)
+
+    @staticmethod
+    def _offer(queue: asyncio.Queue, message: bytes) -> None:
+        if queue.full():
+            while not queue.empty():
+                queue.get_nowait()
+            message = RESYNC
+        queue.put_nowait(message)
+
+    def _listen(self):
+        while True:
+            pubsub = None
+            try:
+                r, error = get_redis_connection()
+                if r is None:
+                    raise ConnectionError(error)
+                pubsub = r.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(LIVE_FEED_CHANNEL)
+                print(f"[LIVE FEED] Subscribed to {LIVE_FEED_CHANNEL}.")
+                while True:
+                    message = pubsub.get_message(timeout=1.0)
+                    if message and message["type"] == "message":
+                        self._deliver(message["data"])
+            except Exception as e:
+                print(f"[LIVE FEED] ⚠️ Subscription lost ({type(e).__name__}: {e}). Resubscribing.")
+                self._deliver(RESYNC)
+            finally:
+                if pubsub is not None:
+                    try:
+                        pubsub.close()
+                    except Exception:
+                        pass
+            time.sleep(_RESUBSCRIBE_DELAY)
+
+
+broadcaster = _Broadcaster()
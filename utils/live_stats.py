@@ -0,0 +1,28 @@
+"""
+Counters of the live worker's ticks: changed vs unchanged fixtures, skipped writes
+"""
+import time
+
+TICK_STATS_KEY = "live:tick_stats"  # last tick's counts + running totals (GET /status/live-worker)
+TICK_STATS_TTL = 86400  # refreshed by every tick: totals reset after a day without ticks
+
+
+def record_tick_stats(r, changed: int, unchanged: int, wrote: bool) -> None:
+    """Last tick's changed/unchanged counts plus running totals, for monitoring."""
+    pipe = r.pipeline()
+    pipe.hset(TICK_STATS_KEY, mapping={
+        "last_changed": changed,
+        "last_unchanged": unchanged,
+        "last_wrote": int(wrote),
+        "updated_at": int(time.time()),
+    })
+    pipe.hincrby(TICK_STATS_KEY, "ticks", 1)
+    pipe.hincrby(TICK_STATS_KEY, "changed_total", changed)
+    pipe.hincrby(TICK_STATS_KEY, "unchanged_total", unchanged)
+    pipe.hincrby(TICK_STATS_KEY, "writes_skipped", 0 if wrote else 1)
+    pipe.expire(TICK_STATS_KEY, TICK_STATS_TTL)
+    pipe.execute()
+
+
+def get_tick_stats(r) -> dict:
+    return {field.decode(): int(value) for field, value in r.hgetall(TICK_STATS_KEY).items()}
@@ -0,0 +1,158 @@
+"""
+In-process LRU/TTL tier in front of Redis for the hottest cached payloads
+"""
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from dotenv import load_dotenv
+
+from utils import serializer
+from utils.redis_client import get_redis_connection
+
+load_dotenv()
+
+LOCAL_CACHE_MAX_ENTRIES = int(os.getenv("LOCAL_CACHE_MAX_ENTRIES", 512))
+LOCAL_CACHE_MAX_BYTES   = int(os.getenv("LOCAL_CACHE_MAX_BYTES", 32 * 1024 * 1024))
+LOCAL_CACHE_TTL         = float(os.getenv("LOCAL_CACHE_TTL", 60))  # seconds; backstop only
+
+# Writers publish the Redis key they changed here (see publish_invalidation);
+# "*" drops everything (FLUSHDB).
+INVALIDATION_CHANNEL = "cache:invalidate"
+_RESUBSCRIBE_DELAY = 5  # seconds
+
+
+class LocalCache:
+    """Size-bounded LRU of EncodedPayloads (body + ETag) keyed by Redis key.
+
+    Coherence comes from the invalidation channel: the tier only serves while
+    this process is subscribed, and is cleared whenever the subscription is
+    (re)established, so a missed message can't leave a stale copy behind.
+    Entries also expire after `ttl` as a backstop.
+    """
+
+    def __init__(self, max_entries: int = LOCAL_CACHE_MAX_ENTRIES, max_bytes: int = LOCAL_CACHE_MAX_BYTES,
+                 ttl: float = LOCAL_CACHE_TTL):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.enabled = False  # True while subscribed to INVALIDATION_CHANNEL
+        self.generation = 0   # bumped by every invalidation
+        self.hits = self.misses = 0
+        self._entries = OrderedDict()  # key -> (expires_at, payload)
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> serializer.EncodedPayload | None:
+        if not self.enabled:
+            return None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    self._drop(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key: str, payload: serializer.EncodedPayload, generation: int) -> None:
+        """Store `payload` unless an invalidation arrived since it was read (`generation`)."""
+        size = len(payload.body)
+        if not self.enabled or size > self.max_bytes:
+            return
+        with self._lock:
+            if generation != self.generation:
+                return
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = (time.monotonic() + self.ttl, payload)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                self._drop(next(iter(self._entries)))
+
+    def invalidate(self, key: str) -> None:
+        with self._lock:
+            self.generation += 1
+            if key == "*":
+                self._entries.clear()
+                self._bytes = 0
+            elif key in self._entries:
+                self._drop(key)
+
+    def _drop(self, key: str) -> None:
+        _, payload = self._entries.pop(key)
+        self._bytes -= len(payload.body)
+
+
+local_cache = LocalCache()
+
+_listener = None
+_listener_lock = threading.Lock()
+
+
+def publish_invalidation(pipe, key: str) -> None:
+    """Queue the invalidation on the writer's pipeline, so it goes out with (after) the write."""
+    pipe.publish(INVALIDATION_CHANNEL, key)
+
+
+def _listen():
+    while True:
+        pubsub = None
+        try:
+            r, error = get_redis_connection()
+            if r is None:
+                raise ConnectionError(error)
+            pubsub = r.pubsub(ignore_subscribe_messages=True)
+            pubsub.subscribe(INVALIDATION_CHANNEL)
+            local_cache.invalidate("*")
+            local_cache.enabled = True
+            print(f"[CACHE] Local tier enabled, listening on {INVALIDATION_CHANNEL}.")
+            while True:
+                message = pubsub.get_message(timeout=1.0)
+                if message and message["type"] == "message":
+                    local_cache.invalidate(message["data"].decode())
+        except Exception as e:
+            if local_cache.enabled:
+                print(f"[CACHE] ⚠️ Invalidation listener lost ({type(e).__name__}: {e}). Local tier disabled.")
+            local_cache.enabled = False
+            local_cache.invalidate("*")
+        finally:
+            if pubsub is not None:
+                try:
+                    pubsub.close()
+                except Exception:
+                    pass
+        time.sleep(_RESUBSCRIBE_DELAY)
+
+
+def _ensure_listener() -> None:
+    global _listener
+    if _listener is None:
+        with _listener_lock:
+            if _listener is None:
+                _listener = threading.Thread(target=_listen, name="cache-invalidation", daemon=True)
+                _listener.start()
+
+
+def read_through(key: str, if_none_match: str, load) -> serializer.EncodedPayload | None:
+    """Serve `key` from the local tier, else from `load(if_none_match)` (a Redis read).
+
+    A local hit never touches Redis, 304s included. Only full bodies are
+    kept locally; a 304 answered by Redis is passed through as-is.
+    The invalidation listener is started on first use, i.e. only in the
+    processes that serve cached reads (the web workers).
+    """
+    _ensure_listener()
+    payload = local_cache.get(key)
+    if payload is not None:
+        if if_none_match and serializer.etag_matches(if_none_match, payload.etag):
+            return serializer.EncodedPayload(None, payload.etag)
+        return payload
+    generation = local_cache.generation
+    payload = load(if_none_match)
+    if payload is not None and payload.body is not None:
+        local_cache.put(key, payload, generation)
+    return payload
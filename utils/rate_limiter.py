@@ -0,0 +1,145 @@
+"""
+Token-bucket rate limiter for the external API, shared across processes via Redis
+"""
+import os
+import threading
+import time
+from datetime import datetime, timezone
+
+import redis
+from dotenv import load_dotenv
+
+from utils.redis_client import get_redis_connection
+
+load_dotenv()
+
+# API-Sports limits for the current plan. The per-minute default matches the
+# pace the old hard-coded time.sleep(0.6) calls allowed.
+RATE_PER_MINUTE = int(os.getenv("API_RATE_PER_MINUTE", 100))
+RATE_PER_DAY = int(os.getenv("API_RATE_PER_DAY", 7500))
+RATE_BURST = int(os.getenv("API_RATE_BURST", 5))
+
+# KEYS[1] = bucket hash, KEYS[2] = daily counter
+# ARGV[1] = refill rate (tokens/s), ARGV[2] = capacity, ARGV[3] = daily limit (0 = none)
+# Returns "0" when a token was taken, "-1" when the daily limit is spent,
+# otherwise the number of seconds to wait before retrying (as a string so
+# Redis doesn't truncate it to an integer).
+_ACQUIRE_SCRIPT = """
+if redis.replicate_commands then redis.replicate_commands() end
+local rate = tonumber(ARGV[1])
+local capacity = tonumber(ARGV[2])
+local per_day = tonumber(ARGV[3])
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or capacity
+local ts = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+if tokens < 1 then
+  return tostring((1 - tokens) / rate)
+end
+if per_day > 0 then
+  local used = tonumber(redis.call('GET', KEYS[2]) or '0')
+  if used >= per_day then
+    return '-1'
+  end
+  redis.call('INCR', KEYS[2])
+  redis.call('EXPIRE', KEYS[2], 172800)
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens - 1), 'ts', tostring(now))
+redis.call('EXPIRE', KEYS[1], 120)
+return '0'
+"""
+
+
+class RateLimiter:
+    """Per-minute token bucket plus a per-day counter.
+
+    State lives in Redis so every worker thread and process spending the same
+    API key draws from one bucket. If Redis is unavailable it falls back to an
+    in-process bucket (still thread-safe, just not shared across processes).
+    `acquire()` blocks only as long as needed to stay within the limit.
+    """
+
+    def __init__(self, name: str = "api_sports", per_minute: int = RATE_PER_MINUTE,
+                 per_day: int = RATE_PER_DAY, burst: int = RATE_BURST):
+        self.name = name
+        self.rate = per_minute / 60.0
+        self.capacity = max(1, burst)
+        self.per_day = per_day
+        self._lock = threading.Lock()
+        self._tokens = float(self.capacity)
+        self._ts = time.monotonic()
+        self._day = None
+        self._day_count = 0
+        self._r = None
+        self._script = None
+        self._redis_retry_at = 0.0
+
+    def _day_key(self) -> str:
+        # API-Sports resets the daily quota at 00:00 UTC.
+        return f"ratelimit:{self.name}:day:{datetime.now(timezone.utc).strftime('%Y-%m-%d')}"
+
+    def _try_redis(self):
+        if self._r is None:
+            if time.monotonic() < self._redis_retry_at:
+                return None
+            self._r, _ = get_redis_connection()
+            if self._r is None:
+                self._redis_retry_at = time.monotonic() + 30
+                return None
+            self._script = self._r.register_script(_ACQUIRE_SCRIPT)
+        try:
+            result = self._script(
+                keys=[f"ratelimit:{self.name}:bucket", self._day_key()],
+                args=[self.rate, self.capacity, self.per_day],
+            )
+            return float(result)
+        except redis.RedisError as e:
+            print(f"[RATE LIMIT] ⚠️ Redis limiter unavailable ({e}). Falling back to local bucket.")
+            self._r = None
+            self._redis_retry_at = time.monotonic() + 30
+            return None
+
+    def _try_local(self) -> float:
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._ts) * self.rate)
+            self._ts = now
+            if self._tokens < 1:
+                return (1 - self._tokens) / self.rate
+            today = datetime.now(timezone.utc).date()
+            if self._day != today:
+                self._day, self._day_count = today, 0
+            if self.per_day and self._day_count >= self.per_day:
+                return -1
+            self._day_count += 1
+            self._tokens -= 1
+            return 0
+
+    def acquire(self) -> bool:
+        """Block until a request may be sent. Returns False if the daily limit is spent."""
+        while True:
+            wait = self._try_redis()
+            if wait is None:
+                wait = self._try_local()
+            if wait == 0:
+                return True
+            if wait < 0:
+                print(f"[RATE LIMIT] 🛑 Daily limit of {self.per_day} requests reached for {self.name}.")
+                return False
+            time.sleep(wait)
+
+
+_limiter = None
+_limiter_lock = threading.Lock()
+
+
+def get_api_rate_limiter() -> RateLimiter:
+    """Process-wide limiter shared by every SportsAPIClient."""
+    global _limiter
+    if _limiter is None:
+        with _limiter_lock:
+            if _limiter is None:
+                _limiter = RateLimiter()
+    return _limiter
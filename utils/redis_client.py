@@ -1,43 +1,160 @@
 """
 Redis client utility for caching
 """
-import redis
 import os
+import threading
+import time
+
+import redis
+from redis.backoff import NoBackoff
+from redis.retry import Retry
 from dotenv import load_dotenv
 
 load_dotenv()
 
+MAX_CONNECTIONS       = int(os.getenv("REDIS_MAX_CONNECTIONS", 100))
+SOCKET_TIMEOUT        = float(os.getenv("REDIS_SOCKET_TIMEOUT", 5))        # seconds
+HEALTH_CHECK_INTERVAL = int(os.getenv("REDIS_HEALTH_CHECK_INTERVAL", 30))  # seconds idle before a PING
+BREAKER_THRESHOLD     = int(os.getenv("REDIS_BREAKER_THRESHOLD", 3))       # consecutive failures
+BREAKER_COOLDOWN      = float(os.getenv("REDIS_BREAKER_COOLDOWN", 30))     # seconds
+
+
+class CircuitOpenError(redis.ConnectionError):
+    """Raised without touching the network while the breaker is open."""
+
+
+class CircuitBreaker:
+    """Opens after `threshold` consecutive connection failures.
+
+    While open every call fails immediately. After `cooldown` seconds one
+    caller is let through as a probe; its success closes the breaker, its
+    failure keeps it open for another cooldown.
+    """
+
+    def __init__(self, threshold: int = BREAKER_THRESHOLD, cooldown: float = BREAKER_COOLDOWN):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.opened_at = None
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.opened_at is None:
+                return True
+            if time.monotonic() - self.opened_at < self.cooldown:
+                return False
+            self.opened_at = time.monotonic()  # half-open: this caller probes, others keep failing fast
+            return True
+
+    def record_success(self) -> None:
+        if self.failures or self.opened_at is not None:
+            with self._lock:
+                if self.opened_at is not None:
+                    print("[REDIS] Connection restored, closing circuit breaker.")
+                self.failures = 0
+                self.opened_at = None
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            if self.failures >= self.threshold:
+                if self.opened_at is None:
+                    print(f"[REDIS] ⚠️ {self.failures} consecutive failures, opening circuit breaker for {self.cooldown:.0f}s.")
+                self.opened_at = time.monotonic()
+
+    @property
+    def is_open(self) -> bool:
+        return self.opened_at is not None
+
+
+_breaker = CircuitBreaker()
+
+
+class _BreakerConnectionPool(redis.ConnectionPool):
+    """Refuses to hand out connections while the breaker is open (covers pipelines too)."""
+
+    def get_connection(self, *args, **kwargs):
+        if not _breaker.allow():
+            raise CircuitOpenError("Redis circuit breaker is open")
+        return super().get_connection(*args, **kwargs)
+
+
+class _BreakerRedis(redis.Redis):
+    """Redis client that reports each command's outcome to the breaker."""
+
+    def execute_command(self, *args, **options):
+        try:
+            result = super().execute_command(*args, **options)
+        except CircuitOpenError:
+            raise
+        except (redis.ConnectionError, redis.TimeoutError):
+            _breaker.record_failure()
+            raise
+        _breaker.record_success()
+        return result
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def _build_client() -> redis.Redis:
+    options = dict(
+        # Values come back as bytes: payloads may be compressed (utils/serializer)
+        # and cached routes send them on without a UTF-8 round trip.
+        decode_responses=False,
+        socket_connect_timeout=5,
+        socket_timeout=SOCKET_TIMEOUT,
+        socket_keepalive=True,
+        # Idle connections are PINGed before reuse instead of every caller pinging.
+        health_check_interval=HEALTH_CHECK_INTERVAL,
+        max_connections=MAX_CONNECTIONS,
+        # One immediate retry covers a stale pooled socket; a dead Redis
+        # should fail fast and trip the breaker, not back off for seconds.
+        retry=Retry(NoBackoff(), 1),
+    )
+    redis_url = os.getenv("REDIS_URL")
+
+    # Try to connect using REDIS_URL if available
+    if redis_url:
+        pool = _BreakerConnectionPool.from_url(redis_url, **options)
+    else:
+        # Fallback to individual host/port config
+        pool = _BreakerConnectionPool(
+            host=os.getenv("REDIS_HOST", "localhost"),
+            port=int(os.getenv("REDIS_PORT", 6379)),
+            db=int(os.getenv("REDIS_DB", 0)),
+            **options,
+        )
+    return _BreakerRedis(connection_pool=pool)
+
 
 def get_redis_connection():
     """
-    Get a Redis connection instance
+    Get the process-wide Redis client (shared connection pool)
     Returns tuple: (connection_object or None, error_message or None)
+
+    The client is created lazily and PINGed only on first use and while the
+    circuit breaker is recovering; afterwards this is just a lookup. While the
+    breaker is open it returns (None, error) without touching the network.
+
+    Replies are bytes, not str; decode payloads with utils.serializer.loads.
     """
+    global _client
     try:
-        redis_url = os.getenv("REDIS_URL")
-        
-        # Try to connect using REDIS_URL if available
-        if redis_url:
-            r = redis.from_url(redis_url, decode_responses=True)
-        else:
-            # Fallback to individual host/port config
-            host = os.getenv("REDIS_HOST", "localhost")
-            port = int(os.getenv("REDIS_PORT", 6379))
-            db = int(os.getenv("REDIS_DB", 0))
-            
-            r = redis.Redis(
-                host=host,
-                port=port,
-                db=db,
-                decode_responses=True,
-                socket_connect_timeout=5,
-                socket_keepalive=True
-            )
-        
-        r.ping()
-        return r, None
-        
+        if _client is None:
+            with _client_lock:
+                if _client is None:
+                    client = _build_client()
+                    client.ping()
+                    _client = client
+        elif _breaker.is_open:
+            _client.ping()  # raises CircuitOpenError until the cooldown allows a probe
+        return _client, None
+
     except Exception as e:
         error_msg = f"Redis connection error: {type(e).__name__}: {str(e)}"
-        print(error_msg)
+        if not isinstance(e, CircuitOpenError):
+            print(error_msg)
         return None, error_msg
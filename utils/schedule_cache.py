@@ -0,0 +1,195 @@
+"""
+Daily schedule cache: one Redis hash of fixtures per day plus an ordered index
+"""
+import uuid
+
+from utils import serializer
+from utils.local_cache import publish_invalidation
+from utils.versioned_cache import get_versioned, version_key
+
+SCHEDULE_TTL = 432000  # 5 days
+
+# matches:date:{date}:fixtures  hash  fixture_id -> fixture JSON (serializer format)
+# matches:date:{date}:order     list  fixture ids in schedule order
+# matches:date:{date}:version   str   ETag of the day; its presence marks the day as cached
+#                                     (a day with no favourite fixtures has no hash/list)
+# matches:date:{date}           str   legacy single JSON array, read until the day is rewritten
+
+_READ_DAY_SCRIPT = """
+local version = redis.call('GET', KEYS[3])
+if not version then return false end
+local out = {version}
+local ids = redis.call('LRANGE', KEYS[2], 0, -1)
+if #ids > 0 then
+  local values = redis.call('HMGET', KEYS[1], unpack(ids))
+  for i = 1, #values do
+    if values[i] then out[#out + 1] = values[i] end
+  end
+end
+return out
+"""
+
+# Concurrency: every writer replaces the version key, so WATCHing it is enough
+# to detect any concurrent write to the day. Read-modify-write helpers
+# (merge_fixtures, replace_day) run under that WATCH and redo the merge
+# against fresh values when EXEC aborts; no update is lost and no lock is
+# held. (A server-side Lua merge isn't an option: values are compressed.)
+# Every write also publishes day_key(date) so web workers drop their
+# in-process copy of the day (utils/local_cache).
+
+
+def day_key(date: str) -> str:
+    """Legacy key of the day, also the name used for locks and logs."""
+    return f"matches:date:{date}"
+
+
+def _keys(date: str) -> list[str]:
+    base = day_key(date)
+    return [f"{base}:fixtures", f"{base}:order", f"{base}:version"]
+
+
+def _new_version() -> str:
+    return f'"{uuid.uuid4().hex}"'
+
+
+def _queue_write_day(pipe, date: str, fixtures: list, ttl: int) -> None:
+    fixtures_key, order_key, version = _keys(date)
+    pipe.delete(fixtures_key, order_key, day_key(date), version_key(day_key(date)))
+    if fixtures:
+        pipe.hset(fixtures_key, mapping={m["fixture"]["id"]: serializer.dumps(m) for m in fixtures})
+        pipe.rpush(order_key, *dict.fromkeys(m["fixture"]["id"] for m in fixtures))
+        pipe.expire(fixtures_key, ttl)
+        pipe.expire(order_key, ttl)
+    pipe.setex(version, ttl, _new_version())
+    publish_invalidation(pipe, day_key(date))
+
+
+def write_day(r, date: str, fixtures: list, ttl: int) -> None:
+    """Replace the whole day in one MULTI/EXEC and drop the legacy key."""
+    pipe = r.pipeline()
+    _queue_write_day(pipe, date, fixtures, ttl)
+    pipe.execute()
+
+
+def delete_day(r, date: str) -> int:
+    """Drop every key of the day (hash, order, version, legacy copy) in one MULTI/EXEC.
+
+    Returns how many keys existed.
+    """
+    pipe = r.pipeline()
+    pipe.delete(*_keys(date), day_key(date), version_key(day_key(date)))
+    publish_invalidation(pipe, day_key(date))
+    deleted, _ = pipe.execute()
+    return deleted
+
+
+def replace_day(r, date: str, fixtures: list, ttl: int, carry_over) -> list:
+    """write_day that keeps data from the stored copy of each fixture, atomically.
+
+    carry_over(fixture, stored) -> fixture runs (on a shallow copy of each new
+    fixture already in the day) against the values current at commit time, so
+    e.g. events merged by the live worker a moment ago are never dropped.
+    Returns the fixtures written.
+    """
+    fixture_ids = [m["fixture"]["id"] for m in fixtures]
+    fixtures_key, _, version = _keys(date)
+    _migrate_legacy(r, date)
+
+    def txn(pipe):
+        values = pipe.hmget(fixtures_key, fixture_ids) if fixture_ids else []
+        stored = {fid: serializer.loads(value) for fid, value in zip(fixture_ids, values) if value}
+        merged = [
+            carry_over(dict(m), stored[m["fixture"]["id"]]) if m["fixture"]["id"] in stored else m
+            for m in fixtures
+        ]
+        pipe.multi()
+        _queue_write_day(pipe, date, merged, ttl)
+        return merged
+
+    return r.transaction(txn, version, value_from_callable=True)
+
+
+def merge_fixtures(r, date: str, fixture_ids, merge) -> tuple[dict, str | None]:
+    """Atomically read-modify-write some fixtures of the day.
+
+    merge(current) receives {fixture_id: fixture} for the requested ids that
+    are in the day and updates it in place; the result is HSET back with a new
+    version (keeping the day's TTL). It may run more than once if another
+    writer commits in between, so it must not have side effects. Returns the
+    fixtures written and the day's new version (None when nothing was written).
+    """
+    fixture_ids = list(fixture_ids)
+    if not fixture_ids or not _migrate_legacy(r, date):
+        return {}, None
+    fixtures_key, _, version = _keys(date)
+
+    def txn(pipe):
+        values = pipe.hmget(fixtures_key, fixture_ids)
+        current = {fid: serializer.loads(value) for fid, value in zip(fixture_ids, values) if value}
+        if not current:
+            return {}, None
+        ttl = pipe.ttl(fixtures_key)
+        merge(current)
+        new_version = _new_version()
+        pipe.multi()
+        pipe.hset(fixtures_key, mapping={fid: serializer.dumps(m) for fid, m in current.items()})
+        pipe.set(version, new_version, ex=ttl if ttl > 0 else None)
+        publish_invalidation(pipe, day_key(date))
+        return current, new_version
+
+    return r.transaction(txn, version, value_from_callable=True)
+
+
+def day_version(r, date: str) -> str | None:
+    """Current version of the day; it changes on every write, by any writer."""
+    version = r.get(_keys(date)[2])
+    return version.decode() if version else None
+
+
+def read_day(r, date: str) -> list | None:
+    """The full day in schedule order, or None when it isn't cached."""
+    out = r.register_script(_READ_DAY_SCRIPT)(keys=_keys(date))
+    if out is None:
+        legacy = r.get(day_key(date))
+        return serializer.loads(legacy) if legacy else None
+    return [serializer.loads(value) for value in out[1:]]
+
+
+def read_day_raw(r, date: str, if_none_match: str = None) -> serializer.EncodedPayload | None:
+    """The day as `{"data": [...]}` bytes assembled from the stored fixtures without decoding them.
+
+    With a matching `if_none_match` only the version is read (body None, answer 304).
+    """
+    if if_none_match:
+        version = day_version(r, date)
+        if version and serializer.etag_matches(if_none_match, version):
+            return serializer.EncodedPayload(None, version)
+    out = r.register_script(_READ_DAY_SCRIPT)(keys=_keys(date))
+    if out is None:
+        return get_versioned(r, day_key(date), if_none_match)
+    body = b'{"data":[' + b",".join(serializer.unpack(value) for value in out[1:]) + b"]}"
+    return serializer.EncodedPayload(body, out[0].decode())
+
+
+def read_fixtures(r, date: str, fixture_ids) -> dict:
+    """{fixture_id: fixture} for the requested ids that are in the day."""
+    fixture_ids = list(fixture_ids)
+    if not fixture_ids or not _migrate_legacy(r, date):
+        return {}
+    values = r.hmget(_keys(date)[0], fixture_ids)
+    return {fid: serializer.loads(value) for fid, value in zip(fixture_ids, values) if value}
+
+
+def _migrate_legacy(r, date: str) -> bool:
+    """Make sure the day is in the hash layout, converting a legacy array in place.
+
+    Returns False when the day isn't cached at all.
+    """
+    if r.exists(_keys(date)[2]):
+        return True
+    legacy = r.get(day_key(date))
+    if not legacy:
+        return False
+    ttl = r.ttl(day_key(date))
+    write_day(r, date, serializer.loads(legacy), ttl if ttl > 0 else SCHEDULE_TTL)
+    return True
@@ -0,0 +1,133 @@
+"""
+JSON codec for every payload stored in Redis (orjson, stdlib json fallback)
+"""
+import hashlib
+import json
+import os
+import zlib
+
+from dotenv import load_dotenv
+from fastapi import Request, Response
+
+try:
+    import orjson
+except ImportError:  # optional: same output format through the stdlib, just slower
+    orjson = None
+
+# Match stdlib json.dumps semantics: int dict keys become strings, and
+# datetimes / dataclasses go through `default` instead of orjson's own format.
+_ORJSON_OPTIONS = (
+    (orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS)
+    if orjson else 0
+)
+
+JSONDecodeError = orjson.JSONDecodeError if orjson else json.JSONDecodeError  # subclass of ValueError
+
+load_dotenv()
+
+COMPRESS_MIN_BYTES = int(os.getenv("REDIS_COMPRESS_MIN_BYTES", 1024))
+COMPRESS_LEVEL     = int(os.getenv("REDIS_COMPRESS_LEVEL", 6))
+
+# Stored value envelope: magic + format version + codec, then the compressed
+# JSON. JSON text never starts with NUL, so values written before compression
+# existed (and small values stored plain) are still read as-is.
+_MAGIC = b"\x00RZ"
+_FORMAT_VERSION = b"\x01"
+_CODEC_ZLIB = b"z"
+_HEADER = _MAGIC + _FORMAT_VERSION + _CODEC_ZLIB
+
+
+def is_packed(raw) -> bool:
+    return isinstance(raw, bytes) and raw.startswith(_MAGIC)
+
+
+def pack(encoded: bytes) -> bytes:
+    """Wrap encoded JSON in the compressed envelope."""
+    return _HEADER + zlib.compress(encoded, COMPRESS_LEVEL)
+
+
+def unpack(raw):
+    """Encoded JSON from a stored value, decompressing it if it is enveloped."""
+    if not is_packed(raw):
+        return raw
+    header, body = raw[:len(_HEADER)], raw[len(_HEADER):]
+    if header != _HEADER:
+        raise ValueError(f"Unsupported Redis value envelope {header!r}")
+    return zlib.decompress(body)
+
+
+def dumps(obj, default=None, compress: bool = True) -> bytes:
+    """Encode `obj` as compact UTF-8 JSON bytes, ready for SET/SETEX.
+
+    Values of COMPRESS_MIN_BYTES or more are stored compressed (see pack);
+    pass compress=False for values other code reads without `loads`.
+    """
+    if orjson:
+        encoded = orjson.dumps(obj, default=default, option=_ORJSON_OPTIONS)
+    else:
+        encoded = json.dumps(obj, default=default, separators=(",", ":"), ensure_ascii=False).encode()
+    if compress and len(encoded) >= COMPRESS_MIN_BYTES:
+        return pack(encoded)
+    return encoded
+
+
+def loads(raw):
+    """Decode a payload read from Redis: bytes or str, compressed or plain."""
+    raw = unpack(raw)
+    if orjson:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def _as_bytes(raw) -> bytes:
+    return raw.encode() if isinstance(raw, str) else raw
+
+
+def data_envelope(raw) -> bytes:
+    """`{"data": <raw>}` built around an already-encoded payload, without decoding it."""
+    return b'{"data":' + _as_bytes(raw) + b"}"
+
+
+class EncodedPayload:
+    """Already-encoded JSON body plus its ETag (see utils/versioned_cache).
+
+    body is None when the caller's If-None-Match already matched, i.e. the
+    route should answer 304 without the payload ever leaving Redis.
+    """
+
+    __slots__ = ("body", "etag")
+
+    def __init__(self, body: bytes | None, etag: str):
+        self.body = body
+        self.etag = etag
+
+
+def content_etag(body: bytes) -> str:
+    """Strong ETag for an encoded payload (truncated sha256, ~1 ms per MB)."""
+    return '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    if if_none_match.strip() == "*":
+        return True
+    return etag in (tag.strip().removeprefix("W/") for tag in if_none_match.split(","))
+
+
+def json_response(payload, request: Request = None) -> Response:
+    """FastAPI response for a service result.
+
+    An EncodedPayload (versioned Redis read) is sent with its stored ETag;
+    bytes/str are treated as already-encoded JSON and sent as-is; anything
+    else is encoded once with `dumps`. Without a stored version the ETag is
+    hashed from the body. With `request`, a matching If-None-Match is
+    answered with an empty 304.
+    """
+    if isinstance(payload, EncodedPayload):
+        body, etag = payload.body, payload.etag
+    else:
+        # Never the Redis storage envelope: HTTP bodies are plain JSON.
+        body = _as_bytes(payload) if isinstance(payload, (bytes, str)) else dumps(payload, compress=False)
+        etag = content_etag(body)
+    if body is None or (request is not None and etag_matches(request.headers.get("if-none-match", ""), etag)):
+        return Response(status_code=304, headers={"ETag": etag})
+    return Response(content=body, media_type="application/json", headers={"ETag": etag})
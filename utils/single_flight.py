@@ -0,0 +1,122 @@
+"""
+Request coalescing (single-flight) for concurrent cache misses
+"""
+import os
+import threading
+import time
+import uuid
+
+import redis
+from dotenv import load_dotenv
+
+from services.sports_api_client import CONNECT_TIMEOUT, READ_TIMEOUT, MAX_RETRIES, BACKOFF_MAX
+
+load_dotenv()
+
+# Longest a fetch can take through SportsAPIClient._get: every attempt timing
+# out, with the longest backoff in between (Retry-After is capped at
+# BACKOFF_MAX too), plus some slack. The lock must outlive it, or a second
+# process starts the same upstream call mid-fetch.
+_WORST_CASE_FETCH = (MAX_RETRIES + 1) * (CONNECT_TIMEOUT + READ_TIMEOUT) + MAX_RETRIES * BACKOFF_MAX + 10
+
+LOCK_TTL = int(os.getenv("SINGLE_FLIGHT_LOCK_TTL", _WORST_CASE_FETCH))            # seconds
+WAIT_TIMEOUT = float(os.getenv("SINGLE_FLIGHT_WAIT_TIMEOUT", _WORST_CASE_FETCH))  # seconds
+POLL_INTERVAL = 0.1
+
+# Delete the lock only if we still own it (it may have expired and been re-taken).
+_RELEASE_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+  return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+
+class _Call:
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+
+
+_calls = {}
+_calls_lock = threading.Lock()
+
+
+def single_flight(key: str, fetch, read_cached=None, r=None):
+    """Run `fetch()` once for all concurrent callers asking for `key`.
+
+    Within a process, callers that arrive while a fetch for `key` is running
+    wait for it and share its result. Across processes (uvicorn workers, the
+    orchestrator) a Redis lock `lock:{key}` elects one fetcher; the others poll
+    `read_cached()` until the winner has written the cache, and return that.
+
+    read_cached: returns the cached value or None. Pass None when the caller
+      must not be satisfied by what is already in the cache (force refresh);
+      such callers just wait for the lock and then fetch themselves.
+    r: Redis connection; without one only in-process coalescing applies.
+    """
+    with _calls_lock:
+        call = _calls.get(key)
+        leader = call is None
+        if leader:
+            call = _calls[key] = _Call()
+
+    if not leader:
+        if not call.event.wait(WAIT_TIMEOUT):
+            return fetch()
+        if call.error:
+            raise call.error
+        return call.result
+
+    try:
+        call.result = _fetch_with_redis_lock(key, fetch, read_cached, r)
+        return call.result
+    except Exception as e:
+        call.error = e
+        raise
+    finally:
+        with _calls_lock:
+            _calls.pop(key, None)
+        call.event.set()
+
+
+def _fetch_with_redis_lock(key: str, fetch, read_cached, r):
+    if r is None:
+        return fetch()
+
+    lock_key = f"lock:{key}"
+    token = uuid.uuid4().hex
+    deadline = time.monotonic() + WAIT_TIMEOUT
+
+    while True:
+        try:
+            acquired = r.set(lock_key, token, nx=True, ex=LOCK_TTL)
+        except redis.RedisError:
+            return fetch()
+
+        if acquired:
+            try:
+                # Another process may have filled the cache just before we got the lock.
+                cached = read_cached() if read_cached else None
+                return cached if cached is not None else fetch()
+            finally:
+                try:
+                    r.eval(_RELEASE_SCRIPT, 1, lock_key, token)
+                except redis.RedisError:
+                    pass
+
+        # Someone else is fetching — wait for their result or for the lock to go.
+        while True:
+            if time.monotonic() > deadline:
+                return fetch()
+            time.sleep(POLL_INTERVAL)
+            if read_cached:
+                cached = read_cached()
+                if cached is not None:
+                    return cached
+            try:
+                if not r.exists(lock_key):
+                    break
+            except redis.RedisError:
+                return fetch()
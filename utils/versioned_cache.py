@@ -0,0 +1,56 @@
+"""
+Redis payloads stored with a content version, for ETag / 304 on cached routes
+"""
+from utils import serializer
+from utils.local_cache import publish_invalidation
+
+VERSION_PREFIX = "etag:"
+
+
+def version_key(key: str) -> str:
+    return f"{VERSION_PREFIX}{key}"
+
+
+def set_versioned(r, key: str, payload: bytes, ttl: int) -> str:
+    """SETEX `key` and its version (`etag:{key}`) in one MULTI/EXEC.
+
+    Every writer of a key served by a versioned route must go through here,
+    otherwise the stored version would describe an older payload (and
+    in-process copies, see utils/local_cache, would not be invalidated).
+    Returns the new ETag.
+    """
+    etag = serializer.content_etag(payload)
+    pipe = r.pipeline()
+    pipe.setex(key, ttl, payload)
+    pipe.setex(version_key(key), ttl, etag)
+    publish_invalidation(pipe, key)
+    pipe.execute()
+    return etag
+
+
+def get_versioned(r, key: str, if_none_match: str = None, envelope: bool = True):
+    """Read `key` as an EncodedPayload, or None on a miss.
+
+    With `if_none_match`, only the short version key is read first: when it
+    matches, the payload never leaves Redis and body is None (answer 304).
+    envelope: wrap the payload as `{"data": ...}` like the service responses.
+    Keys written before versioning existed get an ETag hashed on the fly.
+    Compressed values are inflated here; a 304 never decompresses anything.
+    """
+    if if_none_match:
+        pipe = r.pipeline(transaction=False)
+        pipe.exists(key)
+        pipe.get(version_key(key))
+        exists, etag = pipe.execute()
+        if not exists:
+            return None
+        if etag and serializer.etag_matches(if_none_match, etag.decode()):
+            return serializer.EncodedPayload(None, etag.decode())
+
+    payload, etag = r.mget(key, version_key(key))
+    if payload is None:
+        return None
+    etag = etag.decode() if etag else serializer.content_etag(payload)
+    payload = serializer.unpack(payload)
+    body = serializer.data_envelope(payload) if envelope else payload
+    return serializer.EncodedPayload(body, etag)